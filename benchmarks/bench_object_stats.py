@@ -0,0 +1,93 @@
+"""Benchmark per-frame object label accounting against the set-membership rules.
+
+The previous implementation added ``obj.classification[0]`` of every object to
+``DatasetTags.dynamic_object`` (one sorted-set rebuild per object). The current
+one takes the most probable label, buffers it and folds the buffers into
+:class:`ObjectStats` with NumPy. With one classification per object (the
+usual perception output) it should be at least as fast for every frame size,
+including empty frames. Objects with several classifications also pay for
+picking the most probable one, which the former rule skipped.
+
+    python benchmarks/bench_object_stats.py [--frames 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from types import SimpleNamespace
+
+from ros2bag_tagger.dataset_tags import DatasetTags
+from ros2bag_tagger.mcap_parser import McapParser
+from ros2bag_tagger.object_stats import LABELS, ObjectStats
+
+FRAME_SIZES = (0, 1, 5, 15, 30, 100)
+
+
+def make_frame(n_objects: int, n_classes: int = 1) -> SimpleNamespace:
+    """A stand-in for a decoded ``PredictedObjects`` message."""
+    return SimpleNamespace(
+        objects=[
+            SimpleNamespace(
+                classification=[
+                    SimpleNamespace(
+                        label=random.randrange(len(LABELS)), probability=random.random()
+                    )
+                    for _ in range(n_classes)
+                ]
+            )
+            for _ in range(n_objects)
+        ]
+    )
+
+
+def set_membership(ros_msg, ds: DatasetTags) -> None:
+    """The former rule: one ``add_dynamic_object`` per object."""
+    for obj in ros_msg.objects:
+        ds.add_dynamic_object(*LABELS[obj.classification[0].label])
+
+
+def _per_frame_us(loop, n_frames: int) -> float:
+    return timeit.timeit(loop, number=1) / n_frames * 1e6
+
+
+def time_set_membership(frame, n_frames: int) -> float:
+    ds = DatasetTags()
+
+    def loop():
+        for _ in range(n_frames):
+            set_membership(frame, ds)
+
+    return _per_frame_us(loop, n_frames)
+
+
+def time_object_stats(frame, n_frames: int) -> float:
+    stats = ObjectStats()
+    update = McapParser._update_dynamic_object_tags
+
+    def loop():
+        for _ in range(n_frames):
+            update(frame, 0, stats)
+        stats.flush()  # the pending NumPy work is part of the cost
+
+    return _per_frame_us(loop, n_frames)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=50_000, help="Frames timed per size")
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'objects':>8} {'classes':>8} {'set [us]':>10} {'stats [us]':>11}")
+    for n_classes in (1, 2):
+        for n_objects in FRAME_SIZES:
+            frame = make_frame(n_objects, n_classes)
+            before = time_set_membership(frame, args.frames)
+            after = time_object_stats(frame, args.frames)
+            print(f"{n_objects:>8} {n_classes:>8} {before:>10.2f} {after:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Benchmark the chunk read-ahead pipeline against a throttled local file.
+
+Every ``read()`` on the bag sleeps in proportion to the bytes returned, which
+emulates slow network storage. Without read-ahead the parser alternates
+between waiting for I/O and decoding; with it the two overlap, so the run
+time approaches ``max(io, decode)`` instead of ``io + decode``.
+
+    python benchmarks/bench_read_ahead.py [--bag BAG.mcap] [--mbps 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from mcap.writer import CompressionType
+from mcap_ros2.writer import Writer
+
+from ros2bag_tagger.mcap_parser import McapParser
+
+ODOMETRY = """std_msgs/Header header
+string child_frame_id
+geometry_msgs/PoseWithCovariance pose
+geometry_msgs/TwistWithCovariance twist
+================================================================================
+MSG: std_msgs/Header
+builtin_interfaces/Time stamp
+string frame_id
+================================================================================
+MSG: builtin_interfaces/Time
+int32 sec
+uint32 nanosec
+================================================================================
+MSG: geometry_msgs/PoseWithCovariance
+geometry_msgs/Pose pose
+float64[36] covariance
+================================================================================
+MSG: geometry_msgs/Pose
+geometry_msgs/Point position
+geometry_msgs/Quaternion orientation
+================================================================================
+MSG: geometry_msgs/Point
+float64 x
+float64 y
+float64 z
+================================================================================
+MSG: geometry_msgs/Quaternion
+float64 x
+float64 y
+float64 z
+float64 w
+================================================================================
+MSG: geometry_msgs/TwistWithCovariance
+geometry_msgs/Twist twist
+float64[36] covariance
+================================================================================
+MSG: geometry_msgs/Twist
+geometry_msgs/Vector3 linear
+geometry_msgs/Vector3 angular
+================================================================================
+MSG: geometry_msgs/Vector3
+float64 x
+float64 y
+float64 z"""
+
+
+def write_bag(path: Path, n_messages: int) -> None:
+    """Write an uncompressed bag with *n_messages* odometry messages (~0.7 kB each)."""
+    with path.open("wb") as fh:
+        writer = Writer(fh, chunk_size=256 * 1024, compression=CompressionType.NONE)
+        schema = writer.register_msgdef("nav_msgs/msg/Odometry", ODOMETRY)
+        for i in range(n_messages):
+            stamp = 1_700_000_000 * 10**9 + i * 10**7
+            writer.write_message(
+                "/localization/kinematic_state",
+                schema,
+                {
+                    "header": {"stamp": {"sec": stamp // 10**9, "nanosec": stamp % 10**9}},
+                    "pose": {"pose": {"position": {"x": float(i)}}, "covariance": [0.1] * 36},
+                    "twist": {"twist": {"linear": {"x": i % 30}}, "covariance": [0.2] * 36},
+                },
+                log_time=stamp,
+                publish_time=stamp,
+            )
+        writer.finish()
+
+
+class ThrottledFile(io.RawIOBase):
+    """Read-only file whose reads take ``size / bytes_per_second`` seconds."""
+
+    def __init__(self, path: Path, bytes_per_second: float) -> None:
+        self._fh = path.open("rb", buffering=0)
+        self._rate = bytes_per_second
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._fh.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._fh.tell()
+
+    def readinto(self, buffer) -> int:
+        n = self._fh.readinto(buffer)
+        time.sleep(n / self._rate)
+        return n
+
+    def close(self) -> None:
+        self._fh.close()
+        super().close()
+
+
+class ThrottledParser(McapParser):
+    bytes_per_second = 20e6
+
+    def _open(self):
+        return io.BufferedReader(ThrottledFile(self.path, self.bytes_per_second))
+
+
+def _run(parser_cls, bag: Path, read_ahead: int) -> float:
+    start = time.perf_counter()
+    parser_cls(bag, read_ahead=read_ahead).infer_tags()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bag", type=Path, help="Existing bag (default: generate one)")
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--mbps", type=float, default=4.0, help="Emulated bandwidth [MB/s]")
+    parser.add_argument("--depth", type=int, default=4, help="Read-ahead queue depth")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bag = args.bag
+        if bag is None:
+            bag = Path(tmp) / "bench.mcap"
+            write_bag(bag, args.messages)
+        ThrottledParser.bytes_per_second = args.mbps * 1e6
+        size_mb = bag.stat().st_size / 1e6
+
+        io_only = size_mb / args.mbps
+        decode_only = _run(McapParser, bag, read_ahead=0)
+        sequential = _run(ThrottledParser, bag, read_ahead=0)
+        pipelined = _run(ThrottledParser, bag, read_ahead=args.depth)
+
+    print(f"bag: {size_mb:.1f} MB at {args.mbps:g} MB/s")
+    print(f"pure I/O (estimated)  : {io_only:.2f} s")
+    print(f"unthrottled           : {decode_only:.2f} s")
+    print(f"read-ahead off        : {sequential:.2f} s")
+    print(f"read-ahead depth {args.depth:<4} : {pipelined:.2f} s ({sequential / pipelined:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Sidecar checkpoints for resuming an interrupted scan of a large bag.
+
+A checkpoint is an ``.npz`` file holding the offset of the last fully
+processed chunk, the parser accumulators as plain arrays and a JSON header.
+It is loaded with ``allow_pickle=False``, so a tampered sidecar cannot run
+code. It is only reused when the bag fingerprint (size, mtime and a hash of
+its first and last bytes) and the parser configuration are unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .utils.npz_cache import load_cached_arrays, save_cached_arrays
+
+CHECKPOINT_VERSION = 1
+# Bytes hashed at each end of the bag for the fingerprint
+_FINGERPRINT_BYTES = 1 << 16
+_HEADER_KEY = "checkpoint_header"
+
+
+def checkpoint_path(bag: Path) -> Path:
+    """Sidecar location of the checkpoint of *bag* (``<bag>.ckpt``)."""
+    return bag.with_name(bag.name + ".ckpt")
+
+
+def fingerprint(bag: Path) -> str:
+    """Cheap identity of *bag*: changes whenever the file is rewritten or grows."""
+    st = bag.stat()
+    digest = hashlib.sha1(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    with bag.open("rb") as fh:
+        digest.update(fh.read(_FINGERPRINT_BYTES))
+        fh.seek(max(st.st_size - _FINGERPRINT_BYTES, 0))
+        digest.update(fh.read(_FINGERPRINT_BYTES))
+    return digest.hexdigest()
+
+
+def save_checkpoint(
+    path: Path,
+    bag_fingerprint: str,
+    config: Dict[str, Any],
+    offset: int,
+    state: Dict[str, Any],
+    arrays: Dict[str, np.ndarray],
+) -> None:
+    """Atomically write the state reached after the chunk starting at *offset*.
+
+    *config* describes what the parser collects; *state* must be JSON
+    serializable and *arrays* must not hold Python objects.
+    """
+    header = {
+        "version": CHECKPOINT_VERSION,
+        "fingerprint": bag_fingerprint,
+        "config": config,
+        "offset": offset,
+        "state": state,
+    }
+    save_cached_arrays(path, {**arrays, _HEADER_KEY: np.array(json.dumps(header))})
+
+
+def load_checkpoint(
+    path: Path, bag_fingerprint: str, config: Dict[str, Any]
+) -> Optional[Tuple[int, Dict[str, Any], Dict[str, np.ndarray]]]:
+    """Return ``(offset, state, arrays)`` if *path* holds a usable checkpoint.
+
+    Checkpoints of another version, of a modified bag or written with a
+    different *config* are ignored.
+    """
+    arrays = load_cached_arrays(path)
+    if arrays is None or _HEADER_KEY not in arrays:
+        return None
+    try:
+        header = json.loads(str(arrays.pop(_HEADER_KEY)))
+    except ValueError:
+        return None
+    if (
+        not isinstance(header, dict)
+        or header.get("version") != CHECKPOINT_VERSION
+        or header.get("fingerprint") != bag_fingerprint
+        or header.get("config") != json.loads(json.dumps(config))
+    ):
+        return None
+    return header["offset"], header["state"], arrays
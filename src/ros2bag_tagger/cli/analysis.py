@@ -1,30 +1,36 @@
 import json
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import typer
 import yaml
 
+from ..intervals import IntervalSet
+
 app = typer.Typer(help="Analyze json files under a directory", invoke_without_command=True)
 
 
-def insert_totals(d: dict) -> Tuple[dict, float]:
-    total = 0.0
-    keys_to_delete = []
+def _union(sets: List[IntervalSet]) -> IntervalSet:
+    return sets[0].union(*sets[1:]) if sets else IntervalSet.empty()
+
+
+def insert_totals(d: dict) -> Tuple[dict, IntervalSet]:
+    """Replace interval sets by durations; each ``total`` is the union of its subtree."""
+    durations = {}
+    subtree = []
     for k, v in d.items():
         if k == "__self":
-            total += v
-            keys_to_delete.append(k)
+            subtree.append(v)
         elif isinstance(v, dict):
-            d[k], subtotal = insert_totals(v)
-            total += subtotal
+            durations[k], child = insert_totals(v)
+            subtree.append(child)
         else:
-            total += v
-    for k in keys_to_delete:
-        del d[k]
-    d["total"] = total
-    return d, total
+            durations[k] = v.duration()
+            subtree.append(v)
+    covered = _union(subtree)
+    durations["total"] = covered.duration()
+    return durations, covered
 
 
 def apply_percent(d: dict, grand_total: float) -> dict:
@@ -39,66 +45,91 @@ def apply_percent(d: dict, grand_total: float) -> dict:
     return result
 
 
-def _format_nested_durations(flat: dict) -> dict:
+def _format_nested_durations(flat: Dict[str, IntervalSet]) -> dict:
+    empty = IntervalSet.empty()
     tree = {}
-    for key, val in flat.items():
+    for key, intervals in flat.items():
         parts = key.split("/")
 
         if len(parts) == 1:
-            tree.setdefault(parts[0], {})
-            tree[parts[0]]["__self"] = tree[parts[0]].get("__self", 0.0) + val
-        elif len(parts) == 2:
-            tree.setdefault(parts[0], {})
-            tree[parts[0]].setdefault(parts[1], 0.0)
-            tree[parts[0]][parts[1]] += val
-        elif len(parts) == 3:
-            tree.setdefault(parts[0], {})
-            tree[parts[0]].setdefault(parts[1], {})
-            tree[parts[0]][parts[1]].setdefault(parts[2], 0.0)
-            tree[parts[0]][parts[1]][parts[2]] += val
-
-    tree, grand_total = insert_totals(tree)
-    tree["total"] = grand_total
-    return apply_percent(tree, grand_total)
-
-
-def _safe_duration(intervals):
-    total = 0.0
-    for interval in intervals:
-        if isinstance(interval, list) and len(interval) == 2:
-            start, end = interval
-            total += end - start
-    return total
-
-
-def _flatten_movement_structure(evm: dict, prefix=""):
-    flat_durations = {}
+            node = tree.setdefault(parts[0], {})
+            node["__self"] = node.get("__self", empty) | intervals
+            continue
+
+        node = tree
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if not isinstance(child, dict):
+                child = node[part] = {"__self": child}
+            node = child
+        leaf = parts[-1]
+        if isinstance(node.get(leaf), dict):
+            node[leaf]["__self"] = node[leaf].get("__self", empty) | intervals
+        else:
+            node[leaf] = node.get(leaf, empty) | intervals
+
+    tree, covered = insert_totals(tree)
+    return apply_percent(tree, covered.duration())
+
+
+def _safe_intervals(intervals) -> IntervalSet:
+    pairs = [
+        interval
+        for interval in intervals
+        if isinstance(interval, list)
+        and len(interval) == 2
+        and all(isinstance(t, (int, float)) for t in interval)
+    ]
+    return IntervalSet.from_pairs(pairs)
+
+
+def _flatten_movement_structure(evm: dict, prefix="") -> Dict[str, IntervalSet]:
+    flat_intervals = {}
     for key, value in evm.items():
         full_key = f"{prefix}/{key}" if prefix else key
         if isinstance(value, list):
-            dur = _safe_duration(value)
-            flat_durations[full_key] = dur
+            flat_intervals[full_key] = _safe_intervals(value)
         elif isinstance(value, dict):
-            flat_durations.update(_flatten_movement_structure(value, prefix=full_key))
-    return flat_durations
+            flat_intervals.update(_flatten_movement_structure(value, prefix=full_key))
+    return flat_intervals
 
 
-def _process(path: Path) -> Tuple[float, Dict[str, float]]:
+def _process(path: Path) -> Dict[str, IntervalSet]:
     file_path = Path(path).expanduser().resolve()
     if not file_path.exists():
         raise typer.Exit(0)
 
-    movement_duration = {}
-
     with file_path.open() as f:
         data = json.load(f)
         ego_movement = data.get("ego_vehicle_movement", {})
-        durations = _flatten_movement_structure(ego_movement)
+        return _flatten_movement_structure(ego_movement)
+
+
+def _select(movements: Dict[str, IntervalSet], prefix: str) -> IntervalSet:
+    """Union of every category at or below the path *prefix*."""
+    prefix = prefix.strip().strip("/")
+    matched = [
+        intervals
+        for category, intervals in movements.items()
+        if category == prefix or category.startswith(prefix + "/")
+    ]
+    if not matched:
+        typer.secho(f"Unknown category: {prefix}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+    return matched[0].union(*matched[1:])
 
-        for category, dur in durations.items():
-            movement_duration[category] = movement_duration.get(category, 0.0) + dur
 
-    return movement_duration
+def _cooccurrence(movements: Dict[str, IntervalSet], expressions: List[str], grand_total: float):
+    result = {}
+    for expression in expressions:
+        operands = expression.split("&")
+        overlap = _select(movements, operands[0])
+        for operand in operands[1:]:
+            overlap = overlap & _select(movements, operand)
+        result[" & ".join(o.strip() for o in operands)] = apply_percent(
+            {"total": overlap.duration()}, grand_total
+        )["total"]
+    return result
 
 
 def _to_dict(d):
@@ -113,6 +144,12 @@ def analyze_directory(
         ..., exists=True, file_okay=False, readable=True, help="Directory that contains .json files"
     ),
     recursive: bool = typer.Option(False, "--recursive", "-r", help="Scan sub-directories too."),
+    cooccur: List[str] = typer.Option(
+        None,
+        "--cooccur",
+        "-c",
+        help='Time two or more categories overlap, e.g. "turn & lane keep/preceding vehicle".',
+    ),
 ) -> None:
     pattern = "**/*.json" if recursive else "*.json"
     targets = list(src_dir.glob(pattern))
@@ -123,12 +160,15 @@ def analyze_directory(
 
     typer.echo(f"Analyzing {len(targets)} json(s)…")
 
-    merged_movements = defaultdict(float)
-
+    # Union per category so overlapping ranges and overlapping bags count once
+    per_category = defaultdict(list)
     for json_file in targets:
-        movement = _process(json_file)
-        for k, v in movement.items():
-            merged_movements[k] += v
+        for category, intervals in _process(json_file).items():
+            per_category[category].append(intervals)
+    merged_movements = {category: _union(sets) for category, sets in per_category.items()}
 
     formatted = _format_nested_durations(merged_movements)
+    if cooccur:
+        grand_total = _union(list(merged_movements.values())).duration()
+        formatted["co-occurrence"] = _cooccurrence(merged_movements, cooccur, grand_total)
     typer.echo(yaml.dump(_to_dict(formatted), allow_unicode=True, sort_keys=False))
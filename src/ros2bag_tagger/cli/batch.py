@@ -1,9 +1,16 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import typer
 
+from ..location import GeofenceIndex
 from ..mcap_parser import McapParser
-from ..utils.bag_info import get_bag_times
+from ..recording import tag_recording
+from ..road_shape import RoadShapeMap
+from ..utils.bag_info import get_bag_times, is_mcap_bag_directory, read_summary
+from ..utils.prefetch import DEFAULT_QUEUE_DEPTH, DEFAULT_READ_SIZE
 
 app = typer.Typer(
     help="Annotate many bags under a directory",
@@ -11,7 +18,17 @@ app = typer.Typer(
 )
 
 
-def _process(path: Path) -> None:
+def _prefetch_summary(path: Path):
+    """Load the summary of the next bag while the current one is being tagged."""
+    if path.is_dir() or path.with_suffix(".json").exists():
+        return None
+    try:
+        return read_summary(path)
+    except Exception:  # the parser reports unreadable files itself
+        return None
+
+
+def _process(path: Path, parser_kwargs: dict, jobs: int | None = None, summary=None) -> None:
     tag_file = path.with_suffix(".json")
 
     # Skip if JSON file already exists
@@ -19,9 +36,11 @@ def _process(path: Path) -> None:
         typer.echo(f"  • {path.name} → {tag_file.name} [SKIPPED: already exists]")
         return
 
-    parser = McapParser(path)
-    tags = parser.infer_tags()
-    start, end = get_bag_times(path)
+    if path.is_dir():
+        tags = tag_recording(path, jobs=jobs, **parser_kwargs)
+    else:
+        tags = McapParser(path, summary=summary, **parser_kwargs).infer_tags()
+    start, end = get_bag_times(path, summary)
     tags.add("time", *[start, end])
 
     tags.validate()
@@ -36,14 +55,52 @@ def annotate_directory(
         ..., exists=True, file_okay=False, readable=True, help="Directory that contains .mcap files"
     ),
     recursive: bool = typer.Option(False, "--recursive", "-r", help="Scan sub-directories too"),
+    lanelet_map: Path = typer.Option(
+        None, "--map", "-m", exists=True, readable=True, help="Lanelet2 .osm map for road_shape"
+    ),
+    geofence: Path = typer.Option(
+        None, "--geofence", "-g", exists=True, readable=True, help="GeoJSON areas for location"
+    ),
+    quality: bool = typer.Option(
+        False, "--quality", "-q", help="Add per-topic rate/gap/drop statistics"
+    ),
+    quality_skew: bool = typer.Option(
+        False,
+        "--quality-skew",
+        help="Also add log/publish time skew to --quality (reads every chunk again)",
+    ),
+    jobs: int = typer.Option(
+        None, "--jobs", "-j", help="Parallel workers for split bag directories [default: CPUs]"
+    ),
+    read_ahead: int = typer.Option(
+        DEFAULT_QUEUE_DEPTH, "--read-ahead", help="Chunks prefetched in the background (0: off)"
+    ),
+    read_size: int = typer.Option(
+        DEFAULT_READ_SIZE, "--read-size", help="Bytes per read of the prefetch thread"
+    ),
+    checkpoint_interval: float = typer.Option(
+        None,
+        "--checkpoint-interval",
+        help="Save resumable progress next to the bag every N seconds",
+    ),
 ) -> None:
     """
     Apply tags (defined by *template*) to every bag inside *src_dir*.
     Results are stored next to each bag as `<bag>.tags.json`.
+    A directory with `metadata.yaml` is tagged as one recording.
     """
 
     pattern = "**/*.mcap" if recursive else "*.mcap"
-    targets = list(src_dir.glob(pattern))
+    metadata_patterns = ["**/metadata.yaml"] if recursive else ["metadata.yaml", "*/metadata.yaml"]
+    bag_dirs = sorted({m.parent for p in metadata_patterns for m in src_dir.glob(p)})
+    recordings = [d for d in bag_dirs if is_mcap_bag_directory(d)]
+    for skipped in sorted(set(bag_dirs) - set(recordings)):
+        typer.secho(
+            f"  • {skipped.name} [SKIPPED: not an MCAP bag directory]", fg=typer.colors.YELLOW
+        )
+    # Splits of a recording are not tagged on their own
+    bags = [b for b in src_dir.glob(pattern) if b.parent not in bag_dirs]
+    targets = recordings + bags
 
     if not targets:
         typer.secho("No bag files found - nothing to do.", fg=typer.colors.YELLOW)
@@ -51,7 +108,23 @@ def annotate_directory(
 
     typer.echo(f"Tagging {len(targets)} bag(s)…")
 
-    for bag in targets:
-        _process(bag)
+    # Built (or loaded from cache) once and shared by every bag
+    parser_kwargs = {
+        "road_map": RoadShapeMap.load(lanelet_map) if lanelet_map else None,
+        "geofences": GeofenceIndex.load(geofence) if geofence else None,
+        "quality": quality or quality_skew,
+        "quality_skew": quality_skew,
+        "read_ahead": read_ahead,
+        "read_size": read_size,
+        "checkpoint_interval": checkpoint_interval,
+    }
+
+    with ThreadPoolExecutor(max_workers=1) as io_pool:
+        next_summary = io_pool.submit(_prefetch_summary, targets[0])
+        for i, bag in enumerate(targets):
+            summary = next_summary.result()
+            if i + 1 < len(targets):
+                next_summary = io_pool.submit(_prefetch_summary, targets[i + 1])
+            _process(bag, parser_kwargs, jobs, summary)
 
     typer.secho("Batch annotation finished!", fg=typer.colors.GREEN)
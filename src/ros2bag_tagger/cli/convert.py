@@ -2,8 +2,12 @@ from pathlib import Path
 
 import typer
 
-from ..mcap_parser import McapParser
+from ..location import GeofenceIndex
+from ..mcap_parser import McapParser, McapTaggerError
+from ..recording import tag_recording
+from ..road_shape import RoadShapeMap
 from ..utils.bag_info import get_bag_times
+from ..utils.prefetch import DEFAULT_QUEUE_DEPTH, DEFAULT_READ_SIZE
 
 app = typer.Typer(
     help="Convert mcap format rosbag files to tagged JSON",
@@ -13,18 +17,89 @@ app = typer.Typer(
 
 @app.callback()
 def convert(
-    bag: Path = typer.Argument(..., exists=True, readable=True, help="Input .mcap"),
+    bag: Path = typer.Argument(
+        ..., exists=True, readable=True, help="Input .mcap or split bag directory"
+    ),
     output: Path = typer.Option(None, "--out", "-o", help="Destination JSON file"),
+    lanelet_map: Path = typer.Option(
+        None, "--map", "-m", exists=True, readable=True, help="Lanelet2 .osm map for road_shape"
+    ),
+    geofence: Path = typer.Option(
+        None, "--geofence", "-g", exists=True, readable=True, help="GeoJSON areas for location"
+    ),
+    quality: bool = typer.Option(
+        False, "--quality", "-q", help="Add per-topic rate/gap/drop statistics"
+    ),
+    quality_skew: bool = typer.Option(
+        False,
+        "--quality-skew",
+        help="Also add log/publish time skew to --quality (reads every chunk again)",
+    ),
+    follow: bool = typer.Option(
+        False, "--follow", "-f", help="Keep tagging a bag that is still being recorded"
+    ),
+    flush_interval: float = typer.Option(
+        10.0, "--flush-interval", help="Seconds between partial JSON writes in follow mode"
+    ),
+    idle_timeout: float = typer.Option(
+        None, "--idle-timeout", help="Stop following after the bag has not grown for N seconds"
+    ),
+    jobs: int = typer.Option(
+        None, "--jobs", "-j", help="Parallel workers for a split bag directory [default: CPUs]"
+    ),
+    read_ahead: int = typer.Option(
+        DEFAULT_QUEUE_DEPTH, "--read-ahead", help="Chunks prefetched in the background (0: off)"
+    ),
+    read_size: int = typer.Option(
+        DEFAULT_READ_SIZE, "--read-size", help="Bytes per read of the prefetch thread"
+    ),
+    checkpoint_interval: float = typer.Option(
+        None,
+        "--checkpoint-interval",
+        help="Save resumable progress next to the bag every N seconds",
+    ),
 ) -> None:
     """Convert a single bag to JSON with tag information."""
-    parser = McapParser(bag)
-    tags = parser.infer_tags()
+    parser_kwargs = {
+        "road_map": RoadShapeMap.load(lanelet_map) if lanelet_map else None,
+        "geofences": GeofenceIndex.load(geofence) if geofence else None,
+        "quality": quality or quality_skew,
+        "quality_skew": quality_skew,
+        "read_ahead": read_ahead,
+        "read_size": read_size,
+        "checkpoint_interval": checkpoint_interval,
+    }
+    out_path = output or bag.with_suffix(".json")
+
+    if follow and (quality or quality_skew or checkpoint_interval is not None):
+        typer.secho(
+            "--follow cannot be combined with --quality or --checkpoint-interval",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    if bag.is_dir():
+        if follow:
+            typer.secho("--follow needs a single .mcap file", fg=typer.colors.RED)
+            raise typer.Exit(1)
+        try:
+            tags = tag_recording(bag, jobs=jobs, **parser_kwargs)
+        except (ValueError, McapTaggerError) as e:
+            typer.secho(f"Cannot tag {bag}: {e}", fg=typer.colors.RED)
+            raise typer.Exit(1)
+    elif follow:
+        parser = McapParser(bag, **parser_kwargs)
+        tags = parser.follow(out_path, flush_interval=flush_interval, idle_timeout=idle_timeout)
+        tags.validate()
+        typer.echo(f"Wrote {out_path}")
+        return
+    else:
+        tags = McapParser(bag, **parser_kwargs).infer_tags()
 
     start, end = get_bag_times(bag)
     tags.add("time", *[start, end])
 
     tags.validate()
 
-    out_path = output or bag.with_suffix(".json")
     out_path.write_text(tags.to_json_str(indent=2, ensure_ascii=False), encoding="utf-8")
     typer.echo(f"Wrote {out_path}")
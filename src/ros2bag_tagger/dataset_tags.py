@@ -8,7 +8,11 @@ class DatasetTags:
 
     def add(self, category: str, *values: str) -> "DatasetTags":
         TagTemplate.validate(category)
-        current = set(self._tags[category])
+        current = self._tags[category]
+        if isinstance(current, str):
+            # Plain-string categories (e.g. a hand-written location) become lists
+            current = [current] if current else []
+        current = set(current)
         current.update(values)
         self._tags[category] = sorted(current)
         return self
@@ -19,6 +23,18 @@ class DatasetTags:
         current.update(values)
         self._tags["dynamic_object"][group] = sorted(current)
 
+    def set_velocity_statistics(self, stats: dict) -> None:
+        """Replace the velocity percentiles/histogram summary."""
+        self._tags["velocity_statistics"] = dict(stats)
+
+    def add_quality(self, topic: str, stats: dict) -> None:
+        """Set the data-quality statistics of *topic*."""
+        self._tags["quality"][topic] = dict(stats)
+
+    def add_object_statistics(self, name: str, stats: dict) -> None:
+        """Set the per-class statistics of object class *name*."""
+        self._tags["object_statistics"][name] = dict(stats)
+
     def to_json_str(self, **kwargs) -> str:
         """Serialize tags to a JSON string."""
         import copy
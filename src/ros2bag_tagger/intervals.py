@@ -0,0 +1,87 @@
+"""Interval algebra on sorted NumPy arrays.
+
+An :class:`IntervalSet` is always normalized: its ``[start, end)`` ranges are
+sorted and pairwise disjoint, so its duration never double-counts overlaps.
+Union, intersection and coverage are vectorized and run in
+``O((n + m) log(n + m))``.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+
+
+class IntervalSet:
+    """Normalized set of half-open time ranges."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray) -> None:
+        self.starts, self.ends = self._normalize(
+            np.asarray(starts, dtype=np.float64), np.asarray(ends, dtype=np.float64)
+        )
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Sequence[float]]) -> "IntervalSet":
+        """Build from ``[start, end]`` pairs; empty or reversed ranges are dropped."""
+        arr = np.asarray(list(pairs), dtype=np.float64).reshape(-1, 2)
+        return cls(arr[:, 0], arr[:, 1])
+
+    @classmethod
+    def empty(cls) -> "IntervalSet":
+        return cls(np.zeros(0), np.zeros(0))
+
+    @staticmethod
+    def _normalize(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        keep = ends > starts
+        starts, ends = starts[keep], ends[keep]
+        if len(starts) == 0:
+            return starts, ends
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+        reach = np.maximum.accumulate(ends)
+        # A new merged range begins wherever a start lies beyond everything before it
+        begins = np.concatenate(([True], starts[1:] > reach[:-1]))
+        first = np.flatnonzero(begins)
+        last = np.concatenate((first[1:] - 1, [len(starts) - 1]))
+        return starts[first], reach[last]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return self.union(other)
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        return self.intersection(other)
+
+    def union(self, *others: "IntervalSet") -> "IntervalSet":
+        sets = (self, *others)
+        return IntervalSet(
+            np.concatenate([s.starts for s in sets]), np.concatenate([s.ends for s in sets])
+        )
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        # For each range of self, the ranges of other overlapping it are contiguous
+        lo = np.searchsorted(other.ends, self.starts, side="right")
+        hi = np.searchsorted(other.starts, self.ends, side="left")
+        n = np.maximum(hi - lo, 0)
+        mine = np.repeat(np.arange(len(self)), n)
+        theirs = np.repeat(lo, n) + (np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n))
+        return IntervalSet(
+            np.maximum(self.starts[mine], other.starts[theirs]),
+            np.minimum(self.ends[mine], other.ends[theirs]),
+        )
+
+    def duration(self) -> float:
+        """Total covered time, overlaps counted once."""
+        return float((self.ends - self.starts).sum())
+
+    def coverage(self, start: float, end: float) -> float:
+        """Fraction of ``[start, end)`` covered by this set."""
+        if end <= start:
+            return 0.0
+        window = IntervalSet(np.array([start]), np.array([end]))
+        return self.intersection(window).duration() / (end - start)
@@ -0,0 +1,142 @@
+"""Geofence lookup for the ``location`` tag.
+
+Named areas come from a GeoJSON ``FeatureCollection`` of ``Polygon`` /
+``MultiPolygon`` features whose coordinates are in the same frame as the
+ego pose (the ``map`` frame of ``/localization/kinematic_state``). The area
+name is read from ``properties.name`` and falls back to the feature ``id``.
+Rings are indexed by an STR R-tree which is cached on disk, so a batch run
+builds it at most once.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from .utils.npz_cache import cache_path_for, load_cached_arrays, save_cached_arrays
+from .utils.spatial_index import STRTree, points_in_polygons, polygon_bounds
+
+_CACHE_VERSION = 1
+
+
+class GeofenceError(RuntimeError):
+    """Raised when the geofence file cannot be read."""
+
+
+def _parse_geojson(path: Path):
+    """Flatten every ring into ``(vertices, offsets, ring_part, part_area, names)``."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise GeofenceError(f"Cannot read geofences from {path}: {e}") from e
+
+    features = data.get("features", [data] if data.get("type") == "Feature" else [])
+    vertices: List[np.ndarray] = []
+    offsets = [0]
+    ring_part: List[int] = []
+    part_area: List[int] = []
+    names: List[str] = []
+
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            parts = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            parts = geometry["coordinates"]
+        else:
+            continue
+        name = (feature.get("properties") or {}).get("name") or feature.get("id")
+        if name is None:
+            raise GeofenceError(f"Feature without a name in {path}")
+
+        names.append(str(name))
+        for rings in parts:
+            part_area.append(len(names) - 1)
+            for ring in rings:
+                ring = np.asarray(ring, dtype=np.float64)[:, :2]
+                if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+                    ring = ring[:-1]  # GeoJSON repeats the first position
+                vertices.append(ring)
+                offsets.append(offsets[-1] + len(ring))
+                ring_part.append(len(part_area) - 1)
+
+    if not names:
+        raise GeofenceError(f"No Polygon/MultiPolygon features in {path}")
+    return (
+        np.vstack(vertices),
+        np.array(offsets),
+        np.array(ring_part),
+        np.array(part_area),
+        np.array(names),
+    )
+
+
+class GeofenceIndex:
+    """Named polygons + STR R-tree answering "which areas does this path enter"."""
+
+    def __init__(
+        self,
+        tree: STRTree,
+        vertices: np.ndarray,
+        offsets: np.ndarray,
+        ring_part: np.ndarray,
+        part_area: np.ndarray,
+        names: np.ndarray,
+    ) -> None:
+        self.tree = tree
+        self.vertices = vertices
+        self.offsets = offsets
+        self.ring_part = ring_part
+        self.part_area = part_area
+        self.names = names
+
+    @classmethod
+    def load(cls, geojson_path: str | Path, use_cache: bool = True) -> "GeofenceIndex":
+        """Build the index for *geojson_path*, reusing the on-disk cache when valid."""
+        geojson_path = Path(geojson_path).expanduser().resolve()
+        if not geojson_path.exists():
+            raise GeofenceError(f"File not found: {geojson_path}")
+
+        cache_path = cache_path_for(geojson_path, f"geofence-v{_CACHE_VERSION}")
+        arrays = load_cached_arrays(cache_path) if use_cache else None
+        if arrays is not None:
+            return cls(
+                STRTree.from_arrays(arrays),
+                arrays["vertices"],
+                arrays["offsets"],
+                arrays["ring_part"],
+                arrays["part_area"],
+                arrays["names"],
+            )
+
+        vertices, offsets, ring_part, part_area, names = _parse_geojson(geojson_path)
+        tree = STRTree(polygon_bounds(vertices, offsets))
+        if use_cache:
+            save_cached_arrays(
+                cache_path,
+                {
+                    **tree.to_arrays(),
+                    "vertices": vertices,
+                    "offsets": offsets,
+                    "ring_part": ring_part,
+                    "part_area": part_area,
+                    "names": names,
+                },
+            )
+        return cls(tree, vertices, offsets, ring_part, part_area, names)
+
+    def areas_along(self, points: np.ndarray) -> List[str]:
+        """Return the sorted names of every area containing one of *points*."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        point_idx, ring_idx = self.tree.query_points(points)
+        inside = points_in_polygons(points, point_idx, ring_idx, self.vertices, self.offsets)
+
+        # A point is in a polygon part if it lies in an odd number of its rings (holes)
+        n_parts = len(self.part_area)
+        key = point_idx[inside] * n_parts + self.ring_part[ring_idx[inside]]
+        keys, counts = np.unique(key, return_counts=True)
+        parts = keys[counts % 2 == 1] % n_parts
+        return sorted(set(self.names[np.unique(self.part_area[parts])].tolist()))
@@ -6,13 +6,32 @@ The implementation relies solely on the PyPIpackage mcap.
 
 from __future__ import annotations
 
+import copy
+import operator
+import os
+import time
 from pathlib import Path
 from sys import float_info
+from typing import BinaryIO
 
+import numpy as np
 from mcap.reader import make_reader
+from mcap.records import Channel, Chunk, DataEnd, Footer, Message, Schema
+from mcap.stream_reader import breakup_chunk
+from mcap.summary import Summary
 from mcap_ros2.decoder import DecoderFactory
 
+from .checkpoint import checkpoint_path, fingerprint, load_checkpoint, save_checkpoint
 from .dataset_tags import DatasetTags
+from .location import GeofenceIndex
+from .object_stats import ObjectStats
+from .quality import merge_quality, read_index_arrays, topic_quality
+from .road_shape import RoadShapeMap
+from .utils.mcap_stream import iter_complete_records
+from .utils.prefetch import DEFAULT_QUEUE_DEPTH, DEFAULT_READ_SIZE, ChunkPrefetcher
+from .velocity_stats import VelocityStats
+
+_probability = operator.attrgetter("probability")
 
 
 class McapTaggerError(RuntimeError):
@@ -22,81 +41,397 @@ class McapTaggerError(RuntimeError):
 class McapParser:
     """Infer :class:DatasetTags from a slice of an MCAP recording."""
 
-    def __init__(self, mcap_path: str | Path, template: dict | None = None) -> None:
+    TOPICS = ("/perception/object_recognition/objects", "/localization/kinematic_state")
+    # Minimum ego displacement [m] between two kept trajectory points
+    TRAJECTORY_STEP = 1.0
+
+    def __init__(
+        self,
+        mcap_path: str | Path,
+        template: dict | None = None,
+        road_map: RoadShapeMap | None = None,
+        geofences: GeofenceIndex | None = None,
+        collect_trajectory: bool = False,
+        quality: bool = False,
+        quality_skew: bool = False,
+        read_ahead: int = DEFAULT_QUEUE_DEPTH,
+        read_size: int = DEFAULT_READ_SIZE,
+        summary: Summary | None = None,
+        checkpoint_interval: float | None = None,
+    ) -> None:
         """Instantiate a parser for *mcap_path*.
 
         Parameters
         ----------
         mcap_path
+        template
+        road_map
+            Lanelet2 road shape index used to fill ``road_shape``.
+        geofences
+            Named area index used to fill ``location``.
+        collect_trajectory
+            Record the ego trajectory even without *road_map*/*geofences*, e.g.
+            in worker processes whose results are map-matched after merging.
+        quality
+            Add per-topic data-quality statistics read from the message indexes.
+        quality_skew
+            Also compute the ``log_time``/``publish_time`` skew, which reads and
+            decompresses every chunk a second time.
+        read_ahead
+            Number of chunks prefetched by a background reader thread; 0 disables it.
+        read_size
+            Bytes per read call of the prefetching thread.
+        summary
+            Already loaded MCAP summary (e.g. prefetched by ``batch``).
+        checkpoint_interval
+            Seconds between checkpoints written next to the bag (``<bag>.ckpt``)
+            so an interrupted scan resumes after the last processed chunk; None
+            disables checkpointing. Only chunk-indexed bags are checkpointed.
         """
         self.path = Path(mcap_path).expanduser().resolve()
         self.template = template
+        self.road_map = road_map
+        self.geofences = geofences
+        self.collect_trajectory = (
+            collect_trajectory or road_map is not None or geofences is not None
+        )
+        self.quality = quality
+        self.quality_skew = quality_skew
+        self.read_ahead = read_ahead
+        self.read_size = read_size
+        self.summary = summary
+        self.checkpoint_interval = checkpoint_interval
         self.velocity = [float_info.max, float_info.min]
+        self.velocity_stats = VelocityStats()
+        self.object_stats = ObjectStats()
+        self.quality_stats: dict[str, dict] = {}
+        # Decimated ego (x, y) positions in the map frame
+        self.trajectory: list[tuple[float, float]] = []
+        # Incremental (follow mode) state
+        self._offset = 0
+        self._schemas: dict[int, Schema] = {}
+        self._channels: dict[int, Channel] = {}
+        self._decoders: dict[int, object] = {}
+        self._log_time_range: list[int] = []
+        self._factory = DecoderFactory()
         if not self.path.exists():
             raise McapTaggerError(f"File not found: {self.path}")
 
+    def __getstate__(self) -> dict:
+        # Decoders are closures generated per schema; rebuilt lazily after unpickling
+        state = self.__dict__.copy()
+        del state["_factory"], state["_decoders"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._factory = DecoderFactory()
+        self._decoders = {}
+
     def infer_tags(self) -> DatasetTags:
         """
         Very naive tag inference.
 
         *Replace this logic.*
         """
+        ds = self._new_tags()
+        self.scan(ds)
+        self._finalize(ds)
+        return ds
+
+    def scan(self, ds: DatasetTags) -> None:
+        """Run the rules over the whole file, updating the accumulators."""
+        with self._open() as fh:
+            rdr = make_reader(fh, decoder_factories=[self._factory])
+            summary = self.summary or rdr.get_summary()
+            chunked = summary is not None and bool(summary.chunk_indexes)
+            if chunked and (self.read_ahead > 0 or self.checkpoint_interval is not None):
+                self._scan_chunks(summary, ds)
+            else:
+                for _, channel, message, ros_msg in rdr.iter_decoded_messages(
+                    topics=list(self.TOPICS),
+                    log_time_order=False,
+                ):
+                    self._apply_rules(channel.topic, ros_msg, ds, message.log_time)
+
+            if self.quality:
+                self._update_quality_stats(fh, summary)
+
+        if self.checkpoint_interval is not None:
+            checkpoint_path(self.path).unlink(missing_ok=True)
+
+    def _scan_chunks(self, summary: Summary, ds: DatasetTags) -> None:
+        """Decode relevant chunks in file order while the next ones are being read.
+
+        With checkpointing enabled, resume after the chunk recorded in a valid
+        checkpoint and save the accumulators every ``checkpoint_interval`` seconds.
+        """
+        self._schemas.update(summary.schemas)
+        self._channels.update(summary.channels)
+        resume_after = -1
+        if self.checkpoint_interval is not None:
+            ckpt_path, bag_id = checkpoint_path(self.path), fingerprint(self.path)
+            restored = load_checkpoint(ckpt_path, bag_id, self._checkpoint_config())
+            if restored is not None:
+                resume_after, state, arrays = restored
+                self._restore_state(state, arrays, ds)
+
+        channel_ids = {c.id for c in summary.channels.values() if c.topic in self.TOPICS}
+        chunk_indexes = [
+            c
+            for c in summary.chunk_indexes
+            if c.chunk_start_offset > resume_after
+            and (not c.message_index_offsets or channel_ids & c.message_index_offsets.keys())
+        ]
+        prefetcher = ChunkPrefetcher(self._open, chunk_indexes, self.read_ahead, self.read_size)
+        last_save = time.monotonic()
+        for chunk_index, chunk in prefetcher:
+            for record in breakup_chunk(chunk):
+                self._consume_record(record, ds)
+            if (
+                self.checkpoint_interval is not None
+                and time.monotonic() - last_save >= self.checkpoint_interval
+            ):
+                save_checkpoint(
+                    ckpt_path,
+                    bag_id,
+                    self._checkpoint_config(),
+                    chunk_index.chunk_start_offset,
+                    *self._checkpoint_state(ds),
+                )
+                last_save = time.monotonic()
+
+    def _checkpoint_config(self) -> dict:
+        """What the accumulators contain; a checkpoint is only resumed with the same."""
+        return {"topics": list(self.TOPICS), "collect_trajectory": self.collect_trajectory}
+
+    def _checkpoint_state(self, ds: DatasetTags) -> tuple[dict, dict[str, np.ndarray]]:
+        """JSON state and arrays needed to continue a scan from the next chunk."""
+        state = {
+            "tags": ds._tags,
+            "velocity": self.velocity,
+            "log_time_range": self._log_time_range,
+        }
+        arrays = {
+            **self.velocity_stats.to_arrays(),
+            **self.object_stats.to_arrays(),
+            "trajectory": np.asarray(self.trajectory, dtype=np.float64).reshape(-1, 2),
+        }
+        return state, arrays
+
+    def _restore_state(self, state: dict, arrays: dict[str, np.ndarray], ds: DatasetTags) -> None:
+        ds._tags.update(state["tags"])
+        self.velocity = list(state["velocity"])
+        self._log_time_range = list(state["log_time_range"])
+        self.velocity_stats = VelocityStats.from_arrays(arrays)
+        self.object_stats = ObjectStats.from_arrays(arrays)
+        self.trajectory = [tuple(point) for point in arrays["trajectory"].tolist()]
+
+    def tags(self) -> DatasetTags:
+        """Return the template completed with everything accumulated so far."""
+        ds = self._new_tags()
+        self._finalize(ds)
+        return ds
+
+    def merge(self, other: "McapParser") -> "McapParser":
+        """Fold the accumulators of *other*, a later split of the same recording, into self."""
+        self.velocity = [
+            min(self.velocity[0], other.velocity[0]),
+            max(self.velocity[1], other.velocity[1]),
+        ]
+        self.velocity_stats.merge(other.velocity_stats)
+        self.object_stats.merge(other.object_stats)
+        self.trajectory.extend(other.trajectory)
+        for topic, stats in other.quality_stats.items():
+            self.quality_stats[topic] = merge_quality(self.quality_stats.get(topic), stats)
+        for log_time in other._log_time_range:
+            self._update_log_time_range(log_time)
+        return self
+
+    def follow(
+        self,
+        out_path: str | Path,
+        poll_interval: float = 1.0,
+        flush_interval: float = 10.0,
+        idle_timeout: float | None = None,
+    ) -> DatasetTags:
+        """Tag a recording that is still being written.
+
+        Complete records are consumed incrementally from the last processed
+        byte offset, and a partial tag JSON is flushed to *out_path* every
+        *flush_interval* seconds. Returns once the data section is closed, or
+        when the file has not grown for *idle_timeout* seconds.
+
+        The file must already exist when the parser is created; start following
+        once the recorder has opened it. Quality statistics and checkpoints are
+        not computed in this mode.
+        """
+        out_path = Path(out_path)
+        ds = self._new_tags()
+        last_flush = last_growth = time.monotonic()
+
+        while True:
+            offset = self._offset
+            finished = self.poll(ds)
+            now = time.monotonic()
+            if self._offset != offset:
+                last_growth = now
+            if finished or (idle_timeout is not None and now - last_growth >= idle_timeout):
+                break
+            if now - last_flush >= flush_interval:
+                self._write_tags(self.snapshot(ds), out_path)
+                last_flush = now
+            time.sleep(poll_interval)
+
+        tags = self.snapshot(ds)
+        self._write_tags(tags, out_path)
+        return tags
+
+    def poll(self, ds: DatasetTags) -> bool:
+        """Consume records written since the last call.
+
+        Returns True once the end of the data section has been reached.
+        """
+        with self._open() as fh:
+            for offset, record in iter_complete_records(fh, self._offset):
+                if isinstance(record, Chunk):
+                    for chunk_record in breakup_chunk(record):
+                        self._consume_record(chunk_record, ds)
+                elif record is not None:
+                    self._consume_record(record, ds)
+                self._offset = offset
+                if isinstance(record, (DataEnd, Footer)):
+                    return True
+        return False
+
+    def snapshot(self, ds: DatasetTags) -> DatasetTags:
+        """Return a copy of *ds* completed with the accumulated velocity and time."""
+        tags = copy.deepcopy(ds)
+        self._finalize(tags)
+        if self._log_time_range:
+            tags.add("time", *[t / 1e9 for t in self._log_time_range])
+        return tags
+
+    def _open(self) -> BinaryIO:
+        return self.path.open("rb")
+
+    def _new_tags(self) -> DatasetTags:
         ds = DatasetTags()
         if self.template:
             ds._tags.update(self.template)
-        factory = DecoderFactory()
-
-        with self.path.open("rb") as fh:
-            rdr = make_reader(fh, decoder_factories=[factory])
-            for _, channel, _, ros_msg in rdr.iter_decoded_messages(
-                topics=["/perception/object_recognition/objects", "/localization/kinematic_state"],
-                log_time_order=False,
-            ):
-                self._apply_rules(channel.topic, ros_msg, ds)
+        return ds
 
+    def _finalize(self, ds: DatasetTags) -> None:
+        """Write the accumulated statistics into *ds*."""
         ds.add("velocity", *self.velocity)
-        return ds
+        ds.set_velocity_statistics(self.velocity_stats.to_dict())
+        for topic, stats in self.quality_stats.items():
+            ds.add_quality(topic, stats)
+        self._add_object_tags(ds)
+        self._add_map_tags(ds)
+
+    def _update_quality_stats(self, fh, summary) -> None:
+        """Compute per-topic quality statistics without decoding any message."""
+        if summary is None:
+            raise McapTaggerError("Quality statistics need an indexed MCAP (summary missing)")
+        # Channels of the same topic are interleaved, so their times are pooled
+        # rather than merged like consecutive splits
+        per_topic: dict[str, tuple[list, list]] = {}
+        arrays = read_index_arrays(fh, summary, with_skew=self.quality_skew)
+        for channel_id, (log_times, publish_times) in arrays.items():
+            logs, publishes = per_topic.setdefault(summary.channels[channel_id].topic, ([], []))
+            logs.append(log_times)
+            publishes.append(publish_times)
+        for topic, (logs, publishes) in per_topic.items():
+            self.quality_stats[topic] = topic_quality(
+                np.concatenate(logs), np.concatenate(publishes)
+            )
+
+    def _add_object_tags(self, ds: DatasetTags) -> None:
+        """Fill dynamic_object and object_statistics from the accumulated counts."""
+        for group, name in self.object_stats.seen():
+            ds.add_dynamic_object(group, name)
+        for name, stats in self.object_stats.to_dict().items():
+            ds.add_object_statistics(name, stats)
+
+    def _add_map_tags(self, ds: DatasetTags) -> None:
+        """Match the decimated trajectory against the map indexes."""
+        if not self.trajectory:
+            return
+        points = np.asarray(self.trajectory)
+        if self.road_map is not None:
+            ds.add("road_shape", *self.road_map.shapes_along(points))
+        if self.geofences is not None:
+            ds.add("location", *self.geofences.areas_along(points))
+
+    def _consume_record(self, record, ds: DatasetTags) -> None:
+        """Track schemas/channels and apply the rules to relevant messages."""
+        if isinstance(record, Schema):
+            self._schemas[record.id] = record
+        elif isinstance(record, Channel):
+            self._channels[record.id] = record
+        elif isinstance(record, Message):
+            self._update_log_time_range(record.log_time)
+            channel = self._channels.get(record.channel_id)
+            if channel is None or channel.topic not in self.TOPICS:
+                return
+            decoder = self._decoders.get(channel.id)
+            if decoder is None:
+                decoder = self._factory.decoder_for(
+                    channel.message_encoding, self._schemas.get(channel.schema_id)
+                )
+                if decoder is None:
+                    raise McapTaggerError(
+                        f"No decoder for {channel.topic} ({channel.message_encoding})"
+                    )
+                self._decoders[channel.id] = decoder
+            self._apply_rules(channel.topic, decoder(record.data), ds, record.log_time)
+
+    def _update_log_time_range(self, log_time: int) -> None:
+        if not self._log_time_range:
+            self._log_time_range = [log_time, log_time]
+        elif log_time < self._log_time_range[0]:
+            self._log_time_range[0] = log_time
+        elif log_time > self._log_time_range[1]:
+            self._log_time_range[1] = log_time
 
-    def _apply_rules(self, topic: str, ros_msg, ds: DatasetTags) -> None:
+    @staticmethod
+    def _write_tags(tags: DatasetTags, out_path: Path) -> None:
+        """Write *tags* atomically so readers never see a half-written JSON."""
+        tmp_path = out_path.with_name(out_path.name + ".tmp")
+        tmp_path.write_text(tags.to_json_str(indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, out_path)
+
+    def _apply_rules(self, topic: str, ros_msg, ds: DatasetTags, log_time: int) -> None:
         """Inspect each message and mutate DatasetTags in-place."""
 
         if topic == "/perception/object_recognition/objects":
-            self._update_dynamic_object_tags(ros_msg, ds)
+            self._update_dynamic_object_tags(ros_msg, log_time, self.object_stats)
 
         if topic == "/localization/kinematic_state":
             self._update_velocity(ros_msg, self.velocity)
+            self.velocity_stats.add(ros_msg.twist.twist.linear.x, log_time)
+            if self.collect_trajectory:
+                self._update_trajectory(ros_msg, self.trajectory, self.TRAJECTORY_STEP)
 
     @staticmethod
-    def _update_dynamic_object_tags(ros_msg, ds: DatasetTags) -> None:
-        """Add tags to dynamic_object."""
-        for obj in ros_msg.objects:
-            label = obj.classification[0].label
-
-            match label:
-                case 0:
-                    ds.add_dynamic_object("unknown", "unknown")
-                case 1:
-                    ds.add_dynamic_object("vehicle", "car")
-                case 2:
-                    ds.add_dynamic_object("vehicle", "truck")
-                case 3:
-                    ds.add_dynamic_object("vehicle", "bus")
-                case 4:
-                    ds.add_dynamic_object("vehicle", "trailer")
-                case 5:
-                    ds.add_dynamic_object("two_wheeler", "motorcycle")
-                case 6:
-                    ds.add_dynamic_object("two_wheeler", "bicycle")
-                case 7:
-                    ds.add_dynamic_object("pedestrian", "pedestrian")
-                case 8:
-                    ds.add_dynamic_object("pedestrian", "animal")
-                case 9:
-                    ds.add_dynamic_object("unknown", "hazard")
-                case 10:
-                    ds.add_dynamic_object("unknown", "over_drivable")
-                case 11:
-                    ds.add_dynamic_object("unknown", "under_drivable")
+    def _update_dynamic_object_tags(ros_msg, log_time: int, stats: ObjectStats) -> None:
+        """Count the most probable label of every object in the frame."""
+        objects = ros_msg.objects
+        if not objects:
+            stats.n_frames += 1  # cheapest path for the common empty frame
+            return
+        labels = []
+        for obj in objects:
+            classification = obj.classification
+            if classification:
+                best = (
+                    classification[0]
+                    if len(classification) == 1
+                    else max(classification, key=_probability)
+                )
+                labels.append(best.label)
+        stats.update(labels, log_time)
 
     @staticmethod
     def _update_velocity(ros_msg, velocity):
@@ -106,3 +441,13 @@ class McapParser:
             velocity[0] = current_vel
         if current_vel > velocity[1]:
             velocity[1] = current_vel
+
+    @staticmethod
+    def _update_trajectory(ros_msg, trajectory, step: float) -> None:
+        position = ros_msg.pose.pose.position
+
+        if trajectory:
+            last_x, last_y = trajectory[-1]
+            if (position.x - last_x) ** 2 + (position.y - last_y) ** 2 < step**2:
+                return
+        trajectory.append((position.x, position.y))
@@ -0,0 +1,131 @@
+"""Per-label statistics of perceived dynamic objects.
+
+Label ids follow ``autoware_perception_msgs/msg/ObjectClassification``.
+The label ids of each perception message are appended to plain Python
+buffers, which are folded into the per-class arrays with one
+:func:`numpy.bincount` pass every :data:`FLUSH_FRAMES` frames. Typical frames
+hold only a few objects, where per-call NumPy overhead would dominate.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# (dynamic_object group, class name) indexed by ObjectClassification.label
+LABELS: Tuple[Tuple[str, str], ...] = (
+    ("unknown", "unknown"),
+    ("vehicle", "car"),
+    ("vehicle", "truck"),
+    ("vehicle", "bus"),
+    ("vehicle", "trailer"),
+    ("two_wheeler", "motorcycle"),
+    ("two_wheeler", "bicycle"),
+    ("pedestrian", "pedestrian"),
+    ("pedestrian", "animal"),
+    ("unknown", "hazard"),
+    ("unknown", "over_drivable"),
+    ("unknown", "under_drivable"),
+)
+# Buffered frames folded into the arrays at once
+FLUSH_FRAMES = 4096
+
+
+class ObjectStats:
+    """Counts, frames present and first/last seen time per object class."""
+
+    def __init__(self) -> None:
+        n = len(LABELS)
+        self.n_frames = 0
+        self.counts = np.zeros(n, dtype=np.int64)
+        self.frames = np.zeros(n, dtype=np.int64)
+        self.first_seen = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+        self.last_seen = np.full(n, np.iinfo(np.int64).min, dtype=np.int64)
+        # Non-empty frames not yet folded into the arrays
+        self._labels: List[int] = []
+        self._sizes: List[int] = []
+        self._stamps: List[int] = []
+
+    def update(self, labels: Sequence[int], stamp: int) -> None:
+        """Account for one perception frame holding objects with *labels* at *stamp* [ns]."""
+        self.n_frames += 1
+        if not len(labels):
+            return
+        self._labels.extend(labels)
+        self._sizes.append(len(labels))
+        self._stamps.append(stamp)
+        if len(self._sizes) >= FLUSH_FRAMES:
+            self.flush()
+
+    def flush(self) -> None:
+        """Fold the buffered frames into the per-class arrays."""
+        if not self._sizes:
+            return
+        n = len(LABELS)
+        labels = np.asarray(self._labels, dtype=np.int64)
+        frame = np.repeat(np.arange(len(self._sizes)), self._sizes)
+        stamps = np.asarray(self._stamps, dtype=np.int64)
+        self._labels, self._sizes, self._stamps = [], [], []
+
+        known = (labels >= 0) & (labels < n)
+        labels, frame = labels[known], frame[known]
+        self.counts += np.bincount(labels, minlength=n)
+        # Distinct (frame, label) pairs: each class counts once per frame
+        pairs = np.unique(frame * n + labels)
+        present, frame = pairs % n, pairs // n
+        self.frames += np.bincount(present, minlength=n)
+        np.minimum.at(self.first_seen, present, stamps[frame])
+        np.maximum.at(self.last_seen, present, stamps[frame])
+
+    def merge(self, other: "ObjectStats") -> "ObjectStats":
+        """Add the frames accumulated by *other* (e.g. another split of the recording)."""
+        self.flush()
+        other.flush()
+        self.n_frames += other.n_frames
+        self.counts += other.counts
+        self.frames += other.frames
+        self.first_seen = np.minimum(self.first_seen, other.first_seen)
+        self.last_seen = np.maximum(self.last_seen, other.last_seen)
+        return self
+
+    def to_arrays(self, prefix: str = "objects") -> Dict[str, np.ndarray]:
+        """Serialize the accumulators into plain arrays (e.g. for :func:`numpy.savez`)."""
+        self.flush()
+        return {
+            f"{prefix}_n_frames": np.array(self.n_frames),
+            f"{prefix}_counts": self.counts,
+            f"{prefix}_frames": self.frames,
+            f"{prefix}_first_seen": self.first_seen,
+            f"{prefix}_last_seen": self.last_seen,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str = "objects") -> "ObjectStats":
+        """Rebuild accumulators serialized by :meth:`to_arrays`."""
+        stats = cls()
+        stats.n_frames = int(arrays[f"{prefix}_n_frames"])
+        for name in ("counts", "frames", "first_seen", "last_seen"):
+            setattr(stats, name, np.array(arrays[f"{prefix}_{name}"], dtype=np.int64))
+        return stats
+
+    def seen(self) -> Tuple[Tuple[str, str], ...]:
+        """Return the ``(group, name)`` of every class observed at least once."""
+        self.flush()
+        return tuple(LABELS[i] for i in np.flatnonzero(self.counts))
+
+    def to_dict(self) -> Dict[str, Dict[str, object]]:
+        """Statistics table keyed by class name, times in seconds."""
+        self.flush()
+        table = {}
+        for i in np.flatnonzero(self.counts):
+            group, name = LABELS[i]
+            table[name] = {
+                "group": group,
+                "count": int(self.counts[i]),
+                "frames_present": int(self.frames[i]),
+                "frames_fraction": float(self.frames[i] / self.n_frames),
+                "first_seen": self.first_seen[i] / 1e9,
+                "last_seen": self.last_seen[i] / 1e9,
+            }
+        return table
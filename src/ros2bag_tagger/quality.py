@@ -0,0 +1,154 @@
+"""Decode-free data-quality statistics.
+
+Message rate, gaps and drop bursts come from the ``log_time`` column of the
+MCAP message index records, which only needs the small index blocks after
+each chunk. The optional ``log_time``/``publish_time`` skew is read from the
+fixed-size message record headers, which costs one more pass decompressing
+every chunk. No CDR payload is ever decoded.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import BinaryIO, Dict, List, Tuple
+
+import numpy as np
+from mcap.data_stream import ReadDataStream
+from mcap.opcode import Opcode
+from mcap.records import Chunk
+from mcap.summary import Summary
+
+try:
+    import lz4.frame as lz4
+except ImportError:  # pragma: no cover - mcap declares it optional as well
+    lz4 = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# A gap longer than this many median periods counts as a dropped-message burst
+DROP_GAP_FACTOR = 3.0
+
+# opcode (1) + length (8) + channel_id (2) + sequence (4) + log_time (8)
+_PUBLISH_TIME_OFFSET = 23
+_INDEX_ENTRY = np.dtype([("log_time", "<u8"), ("offset", "<u8")])
+
+
+def _chunk_records(fh: BinaryIO, chunk_start_offset: int) -> np.ndarray:
+    """Return the uncompressed record bytes of the chunk at *chunk_start_offset*."""
+    fh.seek(chunk_start_offset + 9)
+    chunk = Chunk.read(ReadDataStream(fh))
+    if chunk.compression == "zstd":
+        data = zstandard.decompress(chunk.data, chunk.uncompressed_size)
+    elif chunk.compression == "lz4":
+        data = lz4.decompress(chunk.data)
+    else:
+        data = chunk.data
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _message_indexes(block: bytes) -> List[Tuple[int, np.ndarray]]:
+    """Parse a run of MessageIndex records into ``(channel_id, entries)`` pairs."""
+    out = []
+    pos = 0
+    while pos + 9 <= len(block):
+        opcode, length = struct.unpack_from("<BQ", block, pos)
+        body = pos + 9
+        if opcode == Opcode.MESSAGE_INDEX:
+            channel_id, records_length = struct.unpack_from("<HI", block, body)
+            entries = np.frombuffer(
+                block, dtype=_INDEX_ENTRY, count=records_length // 16, offset=body + 6
+            )
+            out.append((channel_id, entries))
+        pos = body + length
+    return out
+
+
+def read_index_arrays(
+    fh: BinaryIO, summary: Summary, with_skew: bool = False
+) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """Collect ``(log_times, publish_times)`` per channel id from the indexes.
+
+    ``publish_times`` is empty unless *with_skew* is set; without it no chunk
+    is read or decompressed at all.
+    """
+    log_times: Dict[int, List[np.ndarray]] = {}
+    publish_times: Dict[int, List[np.ndarray]] = {}
+
+    for chunk_index in summary.chunk_indexes:
+        if not chunk_index.message_index_offsets:
+            continue
+        fh.seek(chunk_index.chunk_start_offset + chunk_index.chunk_length)
+        indexes = _message_indexes(fh.read(chunk_index.message_index_length))
+        records = _chunk_records(fh, chunk_index.chunk_start_offset) if with_skew else None
+
+        for channel_id, entries in indexes:
+            log_times.setdefault(channel_id, []).append(entries["log_time"])
+            if records is not None:
+                start = entries["offset"].astype(np.int64) + _PUBLISH_TIME_OFFSET
+                raw = records[start[:, None] + np.arange(8)]
+                publish_times.setdefault(channel_id, []).append(raw.view("<u8").ravel())
+
+    return {
+        channel_id: (
+            np.concatenate(times),
+            np.concatenate(publish_times[channel_id])
+            if channel_id in publish_times
+            else np.zeros(0, dtype=np.uint64),
+        )
+        for channel_id, times in log_times.items()
+    }
+
+
+def topic_quality(log_times: np.ndarray, publish_times: np.ndarray) -> Dict[str, float]:
+    """Summarize one topic's timing. Times are nanoseconds, results seconds/Hz."""
+    t = np.sort(log_times).astype(np.int64)
+    stats: Dict[str, float] = {"message_count": int(len(t))}
+
+    gaps = np.diff(t) / 1e9
+    if len(gaps):
+        span = (t[-1] - t[0]) / 1e9
+        period = float(np.median(gaps))
+        bursts = gaps[gaps > DROP_GAP_FACTOR * period] if period > 0 else gaps[:0]
+        stats["rate_hz"] = (len(t) - 1) / span if span > 0 else 0.0
+        stats["max_gap"] = float(gaps.max())
+        stats["drop_bursts"] = int(len(bursts))
+        stats["dropped_messages"] = (
+            int(np.rint(bursts / period).sum() - len(bursts)) if len(bursts) else 0
+        )
+
+    if len(publish_times) == len(log_times) and len(publish_times):
+        skew = (log_times.astype(np.int64) - publish_times.astype(np.int64)) / 1e9
+        stats["skew_mean"] = float(skew.mean())
+        stats["skew_max"] = float(np.abs(skew).max())
+    return stats
+
+
+def _span(stats: Dict[str, float]) -> float:
+    """Seconds between the first and last message of one split."""
+    rate = stats.get("rate_hz", 0.0)
+    return (stats["message_count"] - 1) / rate if rate > 0 else 0.0
+
+
+def merge_quality(a: Dict[str, float] | None, b: Dict[str, float]) -> Dict[str, float]:
+    """Combine the statistics of one topic computed on two splits of a recording."""
+    if not a:
+        return dict(b)
+    merged: Dict[str, float] = {"message_count": a["message_count"] + b["message_count"]}
+
+    timed = [s for s in (a, b) if "max_gap" in s]
+    if timed:
+        span = sum(_span(s) for s in timed)
+        intervals = sum(s["message_count"] - 1 for s in timed)
+        merged["rate_hz"] = intervals / span if span > 0 else 0.0
+        merged["max_gap"] = max(s["max_gap"] for s in timed)
+        merged["drop_bursts"] = sum(s["drop_bursts"] for s in timed)
+        merged["dropped_messages"] = sum(s["dropped_messages"] for s in timed)
+
+    if "skew_mean" in a and "skew_mean" in b:
+        merged["skew_mean"] = (
+            a["skew_mean"] * a["message_count"] + b["skew_mean"] * b["message_count"]
+        ) / merged["message_count"]
+        merged["skew_max"] = max(a["skew_max"], b["skew_max"])
+    return merged
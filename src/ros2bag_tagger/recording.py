@@ -0,0 +1,57 @@
+"""Tagging of split ROS 2 bag directories as one recording.
+
+``ros2 bag record`` writes ``metadata.yaml`` plus ``<name>_0.mcap``,
+``<name>_1.mcap``, ... into one directory. Each split is scanned by its own
+:class:`McapParser` (in parallel worker processes, one per CPU by default) and the
+accumulators are merged in recording order into a single result.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from .dataset_tags import DatasetTags
+from .mcap_parser import McapParser, McapTaggerError
+from .utils.bag_info import bag_files
+
+
+def _scan_split(path: Path, parser_kwargs: dict) -> McapParser:
+    parser = McapParser(path, **parser_kwargs)
+    parser.scan(DatasetTags())
+    return parser
+
+
+def tag_recording(bag_dir: str | Path, jobs: int | None = None, **parser_kwargs) -> DatasetTags:
+    """Infer one :class:`DatasetTags` for every split of *bag_dir*.
+
+    Up to *jobs* splits are scanned at once (default: ``os.cpu_count()``); 1
+    scans them serially in this process.
+    *parser_kwargs* are forwarded to each split's :class:`McapParser`. The
+    map indexes are not sent to the workers: they only collect the trajectory,
+    which is matched once against ``road_map``/``geofences`` after merging.
+    """
+    splits = bag_files(bag_dir)
+    if not splits:
+        raise McapTaggerError(f"No .mcap files in {bag_dir}")
+
+    road_map = parser_kwargs.pop("road_map", None)
+    geofences = parser_kwargs.pop("geofences", None)
+    if road_map is not None or geofences is not None:
+        parser_kwargs["collect_trajectory"] = True
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and len(splits) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(splits))) as pool:
+            parsers = list(pool.map(_scan_split, splits, repeat(parser_kwargs)))
+    else:
+        parsers = [_scan_split(split, parser_kwargs) for split in splits]
+
+    merged = parsers[0]
+    for parser in parsers[1:]:
+        merged.merge(parser)
+    merged.road_map, merged.geofences = road_map, geofences
+    return merged.tags()
@@ -0,0 +1,144 @@
+"""Road shape lookup on a Lanelet2 map.
+
+The ``.osm`` map is parsed directly (no Lanelet2 runtime needed) into one
+polygon per lanelet, each classified once as ``intersection``, ``curve`` or
+``straight``. Polygons are indexed by an STR R-tree which is cached on disk,
+so loading the same map again only costs an ``.npz`` read.
+"""
+
+from __future__ import annotations
+
+import math
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .utils.npz_cache import cache_path_for, load_cached_arrays, save_cached_arrays
+from .utils.spatial_index import STRTree, points_in_polygons, polygon_bounds
+
+ROAD_SHAPES: Tuple[str, ...] = ("intersection", "curve", "straight")
+ROAD_SUBTYPES = {"road", "road_shoulder", "highway"}
+# Total heading change along a lanelet above which it counts as a curve
+CURVE_THRESHOLD_DEG = 20.0
+_CACHE_VERSION = 1
+
+
+class LaneletMapError(RuntimeError):
+    """Raised when the Lanelet2 map cannot be read."""
+
+
+def _heading_change(points: np.ndarray) -> float:
+    """Sum of absolute heading changes along a polyline, in degrees."""
+    seg = np.diff(points, axis=0)
+    seg = seg[np.hypot(seg[:, 0], seg[:, 1]) > 1e-6]
+    if len(seg) < 2:
+        return 0.0
+    heading = np.arctan2(seg[:, 1], seg[:, 0])
+    turn = (np.diff(heading) + math.pi) % (2 * math.pi) - math.pi
+    return float(np.degrees(np.abs(turn).sum()))
+
+
+def _classify(left: np.ndarray, right: np.ndarray, tags: Dict[str, str]) -> int:
+    if "turn_direction" in tags:
+        return ROAD_SHAPES.index("intersection")
+    change = (_heading_change(left) + _heading_change(right)) / 2
+    if change > CURVE_THRESHOLD_DEG:
+        return ROAD_SHAPES.index("curve")
+    return ROAD_SHAPES.index("straight")
+
+
+def _parse_osm(osm_path: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(vertices, offsets, shape_ids)`` for every road lanelet in the map."""
+    nodes: Dict[str, Tuple[float, float]] = {}
+    ways: Dict[str, List[str]] = {}
+    vertices: List[np.ndarray] = []
+    offsets = [0]
+    shape_ids: List[int] = []
+
+    try:
+        for _, elem in ET.iterparse(osm_path, events=("end",)):
+            if elem.tag == "node":
+                tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+                if "local_x" in tags and "local_y" in tags:
+                    nodes[elem.get("id")] = (float(tags["local_x"]), float(tags["local_y"]))
+                elem.clear()
+            elif elem.tag == "way":
+                ways[elem.get("id")] = [nd.get("ref") for nd in elem.iter("nd")]
+                elem.clear()
+            elif elem.tag == "relation":
+                tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+                if tags.get("type") == "lanelet" and tags.get("subtype", "road") in ROAD_SUBTYPES:
+                    bounds = {
+                        m.get("role"): m.get("ref")
+                        for m in elem.iter("member")
+                        if m.get("type") == "way"
+                    }
+                    try:
+                        left = np.array([nodes[n] for n in ways[bounds["left"]]])
+                        right = np.array([nodes[n] for n in ways[bounds["right"]]])
+                    except KeyError:
+                        elem.clear()
+                        continue
+                    vertices.append(np.vstack([left, right[::-1]]))
+                    offsets.append(offsets[-1] + len(left) + len(right))
+                    shape_ids.append(_classify(left, right, tags))
+                elem.clear()
+    except (ET.ParseError, ValueError) as e:
+        raise LaneletMapError(f"Cannot parse Lanelet2 map {osm_path}: {e}") from e
+
+    if not shape_ids:
+        raise LaneletMapError(f"No road lanelets with local_x/local_y nodes in {osm_path}")
+    return np.vstack(vertices), np.array(offsets), np.array(shape_ids)
+
+
+class RoadShapeMap:
+    """Lanelet polygons + STR R-tree answering "which road shapes does this path cross"."""
+
+    def __init__(
+        self, tree: STRTree, vertices: np.ndarray, offsets: np.ndarray, shape_ids: np.ndarray
+    ) -> None:
+        self.tree = tree
+        self.vertices = vertices
+        self.offsets = offsets
+        self.shape_ids = shape_ids
+
+    @classmethod
+    def load(cls, osm_path: str | Path, use_cache: bool = True) -> "RoadShapeMap":
+        """Build the index for *osm_path*, reusing the on-disk cache when valid."""
+        osm_path = Path(osm_path).expanduser().resolve()
+        if not osm_path.exists():
+            raise LaneletMapError(f"File not found: {osm_path}")
+
+        cache_path = cache_path_for(osm_path, f"road_shape-v{_CACHE_VERSION}")
+        arrays = load_cached_arrays(cache_path) if use_cache else None
+        if arrays is not None:
+            return cls(
+                STRTree.from_arrays(arrays),
+                arrays["vertices"],
+                arrays["offsets"],
+                arrays["shape_ids"],
+            )
+
+        vertices, offsets, shape_ids = _parse_osm(osm_path)
+        tree = STRTree(polygon_bounds(vertices, offsets))
+        if use_cache:
+            save_cached_arrays(
+                cache_path,
+                {
+                    **tree.to_arrays(),
+                    "vertices": vertices,
+                    "offsets": offsets,
+                    "shape_ids": shape_ids,
+                },
+            )
+        return cls(tree, vertices, offsets, shape_ids)
+
+    def shapes_along(self, points: np.ndarray) -> List[str]:
+        """Return the sorted road shapes of every lanelet containing one of *points*."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        point_idx, lanelet_idx = self.tree.query_points(points)
+        inside = points_in_polygons(points, point_idx, lanelet_idx, self.vertices, self.offsets)
+        found = np.unique(self.shape_ids[lanelet_idx[inside]])
+        return sorted(ROAD_SHAPES[i] for i in found)
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from pathlib import Path
 
 
-def _mcap_times(mcap_path: Path) -> tuple[datetime, datetime]:
+def read_summary(mcap_path: str | Path):
+    """Return the summary section of *mcap_path* (``None`` when it has none)."""
     from mcap.reader import make_reader  # lazy import
 
+    with Path(mcap_path).open("rb") as fh:
+        return make_reader(fh).get_summary()
+
+
+def _mcap_times(mcap_path: Path, summary=None) -> tuple[datetime, datetime]:
+    from mcap.reader import make_reader  # lazy import
+
+    if summary is not None and summary.statistics:
+        stats = summary.statistics
+        return stats.message_start_time / 1e9, stats.message_end_time / 1e9
+
     with mcap_path.open("rb") as fh:
         rdr = make_reader(fh)
         stats = rdr.get_summary().statistics
@@ -22,8 +35,71 @@ def _mcap_times(mcap_path: Path) -> tuple[datetime, datetime]:
     return start_ns / 1e9, end_ns / 1e9
 
 
-def get_bag_times(path: str | Path) -> tuple[datetime, datetime]:
+def _bag_metadata(bag_dir: Path) -> dict | None:
+    """Return the ``rosbag2_bagfile_information`` block of *bag_dir*/metadata.yaml."""
+    import yaml  # lazy import
+
+    metadata = bag_dir / "metadata.yaml"
+    if not metadata.exists():
+        return None
+    return (yaml.safe_load(metadata.read_text(encoding="utf-8")) or {}).get(
+        "rosbag2_bagfile_information"
+    )
+
+
+def _split_index(path: Path) -> tuple[int, str]:
+    match = re.search(r"_(\d+)\.mcap$", path.name)
+    return (int(match.group(1)) if match else -1, path.name)
+
+
+def is_bag_directory(path: str | Path) -> bool:
+    """True if *path* is a rosbag2 directory (``metadata.yaml`` + splits)."""
+    return Path(path).is_dir() and (Path(path) / "metadata.yaml").exists()
+
+
+def is_mcap_bag_directory(path: str | Path) -> bool:
+    """True if *path* is a rosbag2 directory whose splits are MCAP files (not e.g. sqlite3)."""
+    if not is_bag_directory(path):
+        return False
+    info = _bag_metadata(Path(path)) or {}
+    if info.get("storage_identifier"):
+        return info["storage_identifier"] == "mcap"
+    files = info.get("relative_file_paths")
+    if files:
+        return all(Path(f).suffix == ".mcap" for f in files)
+    return any(Path(path).glob("*.mcap"))
+
+
+def bag_files(path: str | Path) -> list[Path]:
+    """Return the MCAP file of a bag, or every split of a bag directory in recording order."""
+    p = Path(path)
+    if not p.is_dir():
+        return [p]
+    info = _bag_metadata(p)
+    if info and info.get("relative_file_paths"):
+        files = [p / Path(f).name for f in info["relative_file_paths"]]
+    else:
+        files = sorted(p.glob("*.mcap"), key=_split_index)
+    unsupported = [f for f in files if f.suffix != ".mcap"]
+    if unsupported:
+        raise ValueError(f"Unsupported bag type: {unsupported[0]}")
+    return files
+
+
+def _directory_times(bag_dir: Path) -> tuple[datetime, datetime]:
+    info = _bag_metadata(bag_dir)
+    if info and "starting_time" in info and "duration" in info:
+        start_ns = info["starting_time"]["nanoseconds_since_epoch"]
+        return start_ns / 1e9, (start_ns + info["duration"]["nanoseconds"]) / 1e9
+    # No metadata: fall back to the summary of every split
+    times = [_mcap_times(f) for f in bag_files(bag_dir)]
+    return min(t[0] for t in times), max(t[1] for t in times)
+
+
+def get_bag_times(path: str | Path, summary=None) -> tuple[datetime, datetime]:
     p = Path(path)
+    if p.is_dir():
+        return _directory_times(p)
     if p.suffix == ".mcap":
-        return _mcap_times(p)
+        return _mcap_times(p, summary)
     raise ValueError(f"Unsupported bag type: {p}")
@@ -0,0 +1,66 @@
+"""Incremental, offset-based access to the records of an MCAP file.
+
+Unlike :func:`mcap.reader.make_reader`, nothing here relies on the summary
+section, so it also works on files that ``ros2 bag record`` is still writing.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from mcap.data_stream import ReadDataStream
+from mcap.opcode import Opcode
+from mcap.records import Channel, Chunk, DataEnd, Footer, McapRecord, Message, Schema
+from mcap.stream_reader import MAGIC_SIZE, read_magic
+
+# opcode (uint8) + record length (uint64)
+RECORD_PREFIX_SIZE = 9
+
+_READERS = {
+    Opcode.SCHEMA: lambda stream, length: Schema.read(stream),
+    Opcode.CHANNEL: lambda stream, length: Channel.read(stream),
+    Opcode.MESSAGE: Message.read,
+    Opcode.CHUNK: lambda stream, length: Chunk.read(stream),
+    Opcode.DATA_END: lambda stream, length: DataEnd.read(stream),
+    Opcode.FOOTER: lambda stream, length: Footer.read(stream),
+}
+
+
+def iter_complete_records(
+    fh: BinaryIO, offset: int = 0
+) -> Iterator[Tuple[int, Optional[McapRecord]]]:
+    """Yield ``(end_offset, record)`` for every fully written record after *offset*.
+
+    Iteration stops at the first record whose bytes are not all on disk yet, so
+    the caller can resume from the last yielded offset once the file has grown.
+    Record types the tagger does not use are skipped without being read and
+    yielded as ``None``. Iteration also ends after the :class:`Footer`.
+    """
+    size = os.fstat(fh.fileno()).st_size
+    if offset == 0:
+        if size < MAGIC_SIZE:
+            return
+        fh.seek(0)
+        read_magic(ReadDataStream(fh))
+        offset = MAGIC_SIZE
+        yield offset, None
+
+    while offset + RECORD_PREFIX_SIZE <= size:
+        fh.seek(offset)
+        opcode, length = struct.unpack("<BQ", fh.read(RECORD_PREFIX_SIZE))
+        end = offset + RECORD_PREFIX_SIZE + length
+        if end > size:
+            return
+
+        record = None
+        reader = _READERS.get(opcode)
+        if reader is not None:
+            record = reader(ReadDataStream(io.BytesIO(fh.read(length))), length)
+
+        offset = end
+        yield offset, record
+        if isinstance(record, Footer):
+            return
@@ -0,0 +1,47 @@
+"""Atomic ``.npz`` persistence of plain NumPy arrays.
+
+Used for the on-disk map index caches and for scan checkpoints. Files are
+always loaded with ``allow_pickle=False``, so a tampered file can at worst
+be rejected, never execute code.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+
+def cache_path_for(source: Path, kind: str) -> Path:
+    """Return the on-disk cache location of the index built from *source*.
+
+    The key covers the resolved path, size and mtime, so editing the source
+    file invalidates the cache.
+    """
+    source = Path(source).expanduser().resolve()
+    st = source.stat()
+    key = hashlib.sha1(f"{source}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()[:16]
+    cache_root = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_root / "ros2bag_tagger" / f"{source.stem}-{kind}-{key}.npz"
+
+
+def load_cached_arrays(path: Path) -> dict[str, np.ndarray] | None:
+    """Load an ``.npz`` cache written by :func:`save_cached_arrays`, if present."""
+    if not path.exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            return {k: npz[k] for k in npz.files}
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def save_cached_arrays(path: Path, arrays: dict[str, np.ndarray]) -> None:
+    """Write *arrays* to *path* atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp.npz")
+    np.savez(tmp_path, **arrays)
+    tmp_path.replace(path)
@@ -0,0 +1,105 @@
+"""Background read-ahead of MCAP chunks.
+
+A reader thread fetches the raw chunk records into a bounded queue while the
+consumer decompresses and decodes the previous ones, so slow (e.g. network)
+storage and CPU-bound decoding overlap instead of alternating.
+"""
+
+from __future__ import annotations
+
+import io
+import queue
+import threading
+from typing import BinaryIO, Callable, Iterator, Sequence, Tuple
+
+from mcap.data_stream import ReadDataStream
+from mcap.records import Chunk, ChunkIndex
+
+from .mcap_stream import RECORD_PREFIX_SIZE
+
+DEFAULT_QUEUE_DEPTH = 4
+DEFAULT_READ_SIZE = 1 << 20
+
+_DONE = object()
+
+
+class ChunkPrefetcher:
+    """Iterate ``(ChunkIndex, Chunk)`` pairs of *chunk_indexes* in file order,
+    read ahead on a thread.
+
+    *open_file* must return a new binary file object; the reader thread uses
+    its own handle so the consumer is free to seek on another one. At most
+    *depth* chunks are held in memory, each read in *read_size* byte pieces.
+    With ``depth == 0`` no thread is started and each chunk is read inline.
+    """
+
+    def __init__(
+        self,
+        open_file: Callable[[], BinaryIO],
+        chunk_indexes: Sequence[ChunkIndex],
+        depth: int = DEFAULT_QUEUE_DEPTH,
+        read_size: int = DEFAULT_READ_SIZE,
+    ) -> None:
+        self._open_file = open_file
+        self._chunk_indexes = sorted(chunk_indexes, key=lambda c: c.chunk_start_offset)
+        self._read_size = max(read_size, 1)
+        self._depth = max(depth, 0)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+        self._stop = threading.Event()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read_chunk(self, fh: BinaryIO, chunk_index: ChunkIndex) -> bytearray:
+        fh.seek(chunk_index.chunk_start_offset)
+        buf = bytearray()
+        while len(buf) < chunk_index.chunk_length:
+            piece = fh.read(min(self._read_size, chunk_index.chunk_length - len(buf)))
+            if not piece:
+                raise EOFError(f"Truncated chunk at {chunk_index.chunk_start_offset}")
+            buf += piece
+        return buf
+
+    @staticmethod
+    def _parse(buf: bytearray) -> Chunk:
+        body = io.BytesIO(memoryview(buf)[RECORD_PREFIX_SIZE:])
+        return Chunk.read(ReadDataStream(body))
+
+    def _read_all(self) -> None:
+        try:
+            with self._open_file() as fh:
+                for chunk_index in self._chunk_indexes:
+                    if not self._put((chunk_index, self._read_chunk(fh, chunk_index))):
+                        return
+        except BaseException as e:  # handed over to the consumer thread
+            self._put(e)
+            return
+        self._put(_DONE)
+
+    def __iter__(self) -> Iterator[Tuple[ChunkIndex, Chunk]]:
+        if self._depth == 0:
+            with self._open_file() as fh:
+                for chunk_index in self._chunk_indexes:
+                    yield chunk_index, self._parse(self._read_chunk(fh, chunk_index))
+            return
+
+        reader = threading.Thread(target=self._read_all, name="mcap-prefetch", daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                chunk_index, buf = item
+                yield chunk_index, self._parse(buf)
+        finally:
+            self._stop.set()
+            reader.join()
@@ -0,0 +1,152 @@
+"""Packed STR R-tree and vectorized point-in-polygon tests.
+
+Everything works on batches of points held in NumPy arrays, so a whole
+trajectory is matched against a map with a handful of array operations
+instead of a Python loop per pose.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+class STRTree:
+    """Static R-tree bulk-loaded with the Sort-Tile-Recursive algorithm.
+
+    *bounds* is an ``(N, 4)`` array of ``[min_x, min_y, max_x, max_y]``
+    boxes. Node *i* on a level covers entries ``[i * capacity, (i + 1) *
+    capacity)`` of the level below, so no child pointers are stored.
+    """
+
+    def __init__(self, bounds: np.ndarray, capacity: int = 16) -> None:
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self.capacity = capacity
+        self.order = self._str_order(bounds, capacity)
+        # levels[0] holds the item boxes in STR order, levels[-1] the root(s)
+        self.levels = [bounds[self.order]]
+        while len(self.levels[-1]) > 1:
+            self.levels.append(self._parent_bounds(self.levels[-1], capacity))
+
+    @staticmethod
+    def _str_order(bounds: np.ndarray, capacity: int) -> np.ndarray:
+        n = len(bounds)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        cx = (bounds[:, 0] + bounds[:, 2]) / 2
+        cy = (bounds[:, 1] + bounds[:, 3]) / 2
+        n_slices = math.ceil(math.sqrt(math.ceil(n / capacity)))
+        slice_size = n_slices * capacity
+        by_x = np.argsort(cx, kind="stable")
+        slice_id = np.arange(n) // slice_size
+        # Sort by y inside each vertical slice
+        return by_x[np.lexsort((cy[by_x], slice_id))]
+
+    @staticmethod
+    def _parent_bounds(child: np.ndarray, capacity: int) -> np.ndarray:
+        starts = np.arange(0, len(child), capacity)
+        return np.column_stack(
+            [
+                np.minimum.reduceat(child[:, 0], starts),
+                np.minimum.reduceat(child[:, 1], starts),
+                np.maximum.reduceat(child[:, 2], starts),
+                np.maximum.reduceat(child[:, 3], starts),
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def query_points(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(point_idx, item_idx)`` pairs whose item box contains the point."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(self) == 0 or len(points) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        pt = np.arange(len(points))
+        node = np.zeros(len(points), dtype=np.int64)
+        for depth in range(len(self.levels) - 1, -1, -1):
+            level = self.levels[depth]
+            if depth != len(self.levels) - 1:
+                # Expand every surviving (point, parent) pair to its children
+                pt = np.repeat(pt, self.capacity)
+                node = (np.repeat(node, self.capacity) * self.capacity) + np.tile(
+                    np.arange(self.capacity), len(node)
+                )
+                valid = node < len(level)
+                pt, node = pt[valid], node[valid]
+            box = level[node]
+            xy = points[pt]
+            hit = (
+                (box[:, 0] <= xy[:, 0])
+                & (xy[:, 0] <= box[:, 2])
+                & (box[:, 1] <= xy[:, 1])
+                & (xy[:, 1] <= box[:, 3])
+            )
+            pt, node = pt[hit], node[hit]
+        return pt, self.order[node]
+
+    def to_arrays(self, prefix: str = "rtree") -> dict[str, np.ndarray]:
+        """Serialize the tree into plain arrays (e.g. for :func:`numpy.savez`)."""
+        arrays = {f"{prefix}_order": self.order, f"{prefix}_capacity": np.array(self.capacity)}
+        for i, level in enumerate(self.levels):
+            arrays[f"{prefix}_level_{i}"] = level
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str = "rtree") -> "STRTree":
+        """Rebuild a tree serialized by :meth:`to_arrays` without re-sorting."""
+        tree = cls.__new__(cls)
+        tree.capacity = int(arrays[f"{prefix}_capacity"])
+        tree.order = np.asarray(arrays[f"{prefix}_order"])
+        tree.levels = []
+        while f"{prefix}_level_{len(tree.levels)}" in arrays:
+            tree.levels.append(np.asarray(arrays[f"{prefix}_level_{len(tree.levels)}"]))
+        return tree
+
+
+def polygon_bounds(vertices: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Bounding boxes of polygons stored as concatenated *vertices* + *offsets*."""
+    starts = offsets[:-1]
+    return np.column_stack(
+        [
+            np.minimum.reduceat(vertices[:, 0], starts),
+            np.minimum.reduceat(vertices[:, 1], starts),
+            np.maximum.reduceat(vertices[:, 0], starts),
+            np.maximum.reduceat(vertices[:, 1], starts),
+        ]
+    )
+
+
+def points_in_polygons(
+    points: np.ndarray,
+    point_idx: np.ndarray,
+    polygon_idx: np.ndarray,
+    vertices: np.ndarray,
+    offsets: np.ndarray,
+) -> np.ndarray:
+    """Even-odd test of ``points[point_idx[k]]`` against polygon ``polygon_idx[k]``.
+
+    Polygon *i* is ``vertices[offsets[i]:offsets[i + 1]]`` and is implicitly
+    closed. Returns a boolean mask aligned with the candidate pairs.
+    """
+    if len(point_idx) == 0:
+        return np.zeros(0, dtype=bool)
+    start = offsets[polygon_idx]
+    n_edges = offsets[polygon_idx + 1] - start
+    pair = np.repeat(np.arange(len(point_idx)), n_edges)
+    first_edge = np.cumsum(n_edges) - n_edges
+    local = np.arange(len(pair)) - np.repeat(first_edge, n_edges)
+
+    a = vertices[start[pair] + local]
+    b = vertices[start[pair] + (local + 1) % n_edges[pair]]
+    xy = points[point_idx[pair]]
+
+    straddles = (a[:, 1] > xy[:, 1]) != (b[:, 1] > xy[:, 1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = a[:, 0] + (xy[:, 1] - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+    crossings = straddles & (xy[:, 0] < x_cross)
+    counts = np.bincount(pair, weights=crossings, minlength=len(point_idx))
+    return (counts.astype(np.int64) % 2) == 1
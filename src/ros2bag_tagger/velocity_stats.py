@@ -0,0 +1,149 @@
+"""Bounded-memory streaming statistics of the ego velocity.
+
+Samples are folded into fixed-bin histograms (one by sample count, one by
+time spent in the bin), so memory does not grow with the bag length and two
+:class:`VelocityStats` built from split bags can be merged exactly by adding
+their arrays.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Sequence
+
+import numpy as np
+
+# Histogram range and resolution [m/s]; values outside are clamped to the end bins
+LOWER = -20.0
+UPPER = 80.0
+BIN_WIDTH = 0.1
+# Bin width of the histogram written to the tags [m/s]
+OUTPUT_BIN_WIDTH = 1.0
+# Longer intervals between two samples are treated as a recording gap
+MAX_SAMPLE_INTERVAL = 1.0
+TIME_ABOVE_THRESHOLDS: Sequence[float] = (5.0, 10.0, 15.0, 20.0, 25.0, 30.0)
+
+_N_BINS = int(round((UPPER - LOWER) / BIN_WIDTH))
+
+
+class VelocityStats:
+    """Mergeable fixed-bin velocity histograms plus exact min/max/mean."""
+
+    def __init__(self) -> None:
+        self.counts = np.zeros(_N_BINS, dtype=np.int64)
+        self.durations = np.zeros(_N_BINS, dtype=np.float64)
+        self.n = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._last_time: int | None = None
+        self._last_bin = 0
+
+    @staticmethod
+    def _bin(value: float) -> int:
+        # The epsilon keeps values on a bin edge (e.g. thresholds) in the upper bin
+        return min(max(math.floor((value - LOWER) / BIN_WIDTH + 1e-9), 0), _N_BINS - 1)
+
+    def add(self, value: float, stamp: int) -> None:
+        """Fold one sample *value* [m/s] observed at *stamp* [ns] into the sketch.
+
+        NaN/inf samples (e.g. from a diverged localization) are ignored.
+        """
+        if not math.isfinite(value):
+            return
+        idx = self._bin(value)
+        self.counts[idx] += 1
+        self.n += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        # Sample-and-hold: the time until this sample is spent at the previous speed
+        if self._last_time is not None:
+            dt = (stamp - self._last_time) / 1e9
+            if 0.0 < dt <= MAX_SAMPLE_INTERVAL:
+                self.durations[self._last_bin] += dt
+        if self._last_time is None or stamp >= self._last_time:
+            self._last_time = stamp
+            self._last_bin = idx
+
+    def merge(self, other: "VelocityStats") -> "VelocityStats":
+        """Add the samples of *other* (e.g. the next split of the same recording)."""
+        self.counts += other.counts
+        self.durations += other.durations
+        self.n += other.n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if other._last_time is not None and (
+            self._last_time is None or other._last_time > self._last_time
+        ):
+            self._last_time, self._last_bin = other._last_time, other._last_bin
+        return self
+
+    def to_arrays(self, prefix: str = "velocity") -> Dict[str, np.ndarray]:
+        """Serialize the sketch into plain arrays (e.g. for :func:`numpy.savez`)."""
+        last_time = -1 if self._last_time is None else self._last_time
+        return {
+            f"{prefix}_counts": self.counts,
+            f"{prefix}_durations": self.durations,
+            f"{prefix}_moments": np.array([self.total, self.min, self.max]),
+            f"{prefix}_state": np.array(
+                [self.n, self._last_time is not None, last_time, self._last_bin], dtype=np.int64
+            ),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str = "velocity") -> "VelocityStats":
+        """Rebuild a sketch serialized by :meth:`to_arrays`."""
+        stats = cls()
+        stats.counts = np.array(arrays[f"{prefix}_counts"], dtype=np.int64)
+        stats.durations = np.array(arrays[f"{prefix}_durations"], dtype=np.float64)
+        stats.total, stats.min, stats.max = (float(v) for v in arrays[f"{prefix}_moments"])
+        n, has_last, last_time, last_bin = (int(v) for v in arrays[f"{prefix}_state"])
+        stats.n, stats._last_bin = n, last_bin
+        stats._last_time = last_time if has_last else None
+        return stats
+
+    def percentile(self, q: float) -> float:
+        """Approximate *q*-th percentile (0-100), exact to within one bin width."""
+        if self.n == 0:
+            return math.nan
+        cum = np.cumsum(self.counts)
+        rank = q / 100.0 * self.n
+        idx = int(np.searchsorted(cum, rank, side="left"))
+        idx = min(idx, _N_BINS - 1)
+        below = cum[idx - 1] if idx else 0
+        inside = (rank - below) / self.counts[idx] if self.counts[idx] else 0.0
+        value = LOWER + (idx + inside) * BIN_WIDTH
+        return float(min(max(value, self.min), self.max))
+
+    def time_above(self, threshold: float) -> float:
+        """Seconds spent at a velocity of at least *threshold*."""
+        return float(self.durations[self._bin(threshold) :].sum())
+
+    def to_dict(self) -> Dict[str, object]:
+        """Summary written to the ``velocity_statistics`` tag."""
+        if self.n == 0:
+            return {}
+
+        per_bin = int(round(OUTPUT_BIN_WIDTH / BIN_WIDTH))
+        coarse = self.durations.reshape(-1, per_bin).sum(axis=1)
+        nonzero = np.flatnonzero(coarse)
+        first, last = (nonzero[0], nonzero[-1]) if len(nonzero) else (0, -1)
+        return {
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.n,
+            "p5": self.percentile(5),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "histogram": {
+                "start": LOWER + first * OUTPUT_BIN_WIDTH,
+                "bin_width": OUTPUT_BIN_WIDTH,
+                "seconds": [round(float(t), 3) for t in coarse[first : last + 1]],
+            },
+            "time_above": {f"{t:g}": round(self.time_above(t), 3) for t in TIME_ABOVE_THRESHOLDS},
+        }
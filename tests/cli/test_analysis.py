@@ -0,0 +1,50 @@
+import json
+
+import yaml
+from ros2bag_tagger.cli.analysis import _format_nested_durations, _process, app
+from ros2bag_tagger.intervals import IntervalSet
+from typer.testing import CliRunner
+
+
+def _movements(**categories):
+    return {
+        key.replace("__", "/"): IntervalSet.from_pairs(pairs) for key, pairs in categories.items()
+    }
+
+
+def test_totals_are_unions_of_overlapping_siblings():
+    formatted = _format_nested_durations(
+        _movements(turn__left=[[0, 10], [5, 15]], turn__right=[[12, 20]], stop=[[18, 25]])
+    )
+
+    assert formatted["turn"]["left"].startswith("15.0 ")
+    assert formatted["turn"]["right"].startswith("8.0 ")
+    assert formatted["turn"]["total"] == "20.0 (80.0%)"
+    assert formatted["stop"]["total"] == "7.0 (28.0%)"
+    assert formatted["total"] == "25.0 (100.0%)"
+
+
+def test_nested_totals_at_any_depth():
+    formatted = _format_nested_durations(
+        _movements(a__b__c=[[0, 4]], a__b__d=[[2, 6]], a__e=[[5, 10]])
+    )
+
+    assert formatted["a"]["b"]["total"].startswith("6.0 ")
+    assert formatted["a"]["total"].startswith("10.0 ")
+
+
+def test_cli_grand_total_and_cooccurrence_use_the_union(tmp_path):
+    for name, movement in {
+        "a.json": {"turn": {"left": [[0, 10]], "right": [[12, 20]]}},
+        "b.json": {"turn": {"left": [[5, 15]]}, "lane keep": {"normal": [[0, 20]]}},
+    }.items():
+        (tmp_path / name).write_text(json.dumps({"ego_vehicle_movement": movement}))
+    assert set(_process(tmp_path / "a.json")) == {"turn/left", "turn/right"}
+
+    result = CliRunner().invoke(app, ["-c", "turn & lane keep", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    report = yaml.safe_load(result.output.split("\n", 1)[1])
+    assert report["total"] == "20.0 (100.0%)"
+    assert report["turn"]["total"] == "20.0 (100.0%)"
+    assert report["co-occurrence"]["turn & lane keep"] == "20.0 (100.0%)"
@@ -0,0 +1,34 @@
+import yaml
+from ros2bag_tagger.cli.batch import app
+from typer.testing import CliRunner
+
+
+def test_batch_tags_recording_once_and_skips_its_splits(make_odometry_bag, tmp_path):
+    make_odometry_bag("single.mcap", count=20)
+    make_odometry_bag("run/run_0.mcap", first=0, count=20)
+    make_odometry_bag("run/run_1.mcap", first=20, count=20)
+    info = {"relative_file_paths": ["run_0.mcap", "run_1.mcap"]}
+    (tmp_path / "run" / "metadata.yaml").write_text(
+        yaml.safe_dump({"rosbag2_bagfile_information": info})
+    )
+
+    result = CliRunner().invoke(app, ["--recursive", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "Tagging 2 bag(s)" in result.output
+    assert sorted(p.name for p in tmp_path.rglob("*.json")) == ["run.json", "single.json"]
+
+
+def test_batch_skips_non_mcap_bag_directories(make_odometry_bag, tmp_path):
+    make_odometry_bag("single.mcap", count=20)
+    sqlite_dir = tmp_path / "sqlite_run"
+    sqlite_dir.mkdir()
+    (sqlite_dir / "sqlite_run_0.db3").touch()
+    info = {"storage_identifier": "sqlite3", "relative_file_paths": ["sqlite_run_0.db3"]}
+    (sqlite_dir / "metadata.yaml").write_text(yaml.safe_dump({"rosbag2_bagfile_information": info}))
+
+    result = CliRunner().invoke(app, ["--recursive", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "sqlite_run [SKIPPED: not an MCAP bag directory]" in result.output
+    assert [p.name for p in tmp_path.rglob("*.json")] == ["single.json"]
@@ -0,0 +1,14 @@
+import yaml
+from ros2bag_tagger.cli.convert import app
+from typer.testing import CliRunner
+
+
+def test_convert_rejects_non_mcap_bag_directory(tmp_path):
+    (tmp_path / "run_0.db3").touch()
+    info = {"storage_identifier": "sqlite3", "relative_file_paths": ["run_0.db3"]}
+    (tmp_path / "metadata.yaml").write_text(yaml.safe_dump({"rosbag2_bagfile_information": info}))
+
+    result = CliRunner().invoke(app, [str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert "Unsupported bag type" in result.output
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+from mcap.writer import CompressionType
+from mcap_ros2.writer import Writer
+
+ODOMETRY = """std_msgs/Header header
+string child_frame_id
+geometry_msgs/PoseWithCovariance pose
+geometry_msgs/TwistWithCovariance twist
+================================================================================
+MSG: std_msgs/Header
+builtin_interfaces/Time stamp
+string frame_id
+================================================================================
+MSG: builtin_interfaces/Time
+int32 sec
+uint32 nanosec
+================================================================================
+MSG: geometry_msgs/PoseWithCovariance
+geometry_msgs/Pose pose
+float64[36] covariance
+================================================================================
+MSG: geometry_msgs/Pose
+geometry_msgs/Point position
+geometry_msgs/Quaternion orientation
+================================================================================
+MSG: geometry_msgs/Point
+float64 x
+float64 y
+float64 z
+================================================================================
+MSG: geometry_msgs/Quaternion
+float64 x
+float64 y
+float64 z
+float64 w
+================================================================================
+MSG: geometry_msgs/TwistWithCovariance
+geometry_msgs/Twist twist
+float64[36] covariance
+================================================================================
+MSG: geometry_msgs/Twist
+geometry_msgs/Vector3 linear
+geometry_msgs/Vector3 angular
+================================================================================
+MSG: geometry_msgs/Vector3
+float64 x
+float64 y
+float64 z"""
+
+START_NS = 1_700_000_000 * 10**9
+STEP_NS = 100_000_000
+
+
+def write_odometry_bag(path: Path, first: int = 0, count: int = 200, skew_ns: int = 0) -> Path:
+    """Write odometry messages *first*..*first+count* at 10 Hz in small chunks.
+
+    Message ``i`` drives at ``i % 30`` m/s and sits at ``x = 2 * i`` so the
+    trajectory keeps every point. ``publish_time`` lags ``log_time`` by *skew_ns*.
+    """
+    with path.open("wb") as fh:
+        writer = Writer(fh, chunk_size=4096, compression=CompressionType.NONE)
+        schema = writer.register_msgdef("nav_msgs/msg/Odometry", ODOMETRY)
+        for i in range(first, first + count):
+            stamp = START_NS + i * STEP_NS
+            writer.write_message(
+                "/localization/kinematic_state",
+                schema,
+                {
+                    "header": {"stamp": {"sec": stamp // 10**9, "nanosec": stamp % 10**9}},
+                    "pose": {"pose": {"position": {"x": 2.0 * i}}},
+                    "twist": {"twist": {"linear": {"x": float(i % 30)}}},
+                },
+                log_time=stamp,
+                publish_time=stamp - skew_ns,
+            )
+        writer.finish()
+    return path
+
+
+@pytest.fixture
+def odometry_bag(tmp_path):
+    """A chunked 20 s odometry bag."""
+    return write_odometry_bag(tmp_path / "odometry.mcap")
+
+
+@pytest.fixture
+def make_odometry_bag(tmp_path):
+    """Factory for :func:`write_odometry_bag` writing below ``tmp_path``."""
+
+    def _make(name: str = "odometry.mcap", **kwargs) -> Path:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return write_odometry_bag(path, **kwargs)
+
+    return _make
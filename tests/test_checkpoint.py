@@ -0,0 +1,123 @@
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+from ros2bag_tagger.checkpoint import (
+    checkpoint_path,
+    fingerprint,
+    load_checkpoint,
+    save_checkpoint,
+)
+from ros2bag_tagger.location import GeofenceIndex
+from ros2bag_tagger.mcap_parser import McapParser
+
+CONFIG = {"topics": ["/a"], "collect_trajectory": False}
+
+
+@pytest.fixture
+def bag(tmp_path):
+    path = tmp_path / "run.mcap"
+    path.write_bytes(b"\x89MCAP0\r\n" + bytes(1000))
+    return path
+
+
+def test_checkpoint_round_trip(bag):
+    ckpt = checkpoint_path(bag)
+    save_checkpoint(
+        ckpt, fingerprint(bag), CONFIG, 4096, {"velocity": [0.0, 12.5]}, {"x": np.ones(3)}
+    )
+
+    offset, state, arrays = load_checkpoint(ckpt, fingerprint(bag), CONFIG)
+
+    assert ckpt.name == "run.mcap.ckpt"
+    assert (offset, state) == (4096, {"velocity": [0.0, 12.5]})
+    assert np.array_equal(arrays["x"], np.ones(3))
+
+
+def test_checkpoint_ignored_when_bag_or_config_changed(bag):
+    ckpt = checkpoint_path(bag)
+    save_checkpoint(ckpt, fingerprint(bag), CONFIG, 4096, {}, {})
+
+    assert load_checkpoint(ckpt, fingerprint(bag), {**CONFIG, "collect_trajectory": True}) is None
+    st = bag.stat()
+    os.utime(bag, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert load_checkpoint(ckpt, fingerprint(bag), CONFIG) is None
+
+
+def test_pickled_or_corrupt_checkpoint_is_never_loaded(bag):
+    ckpt = checkpoint_path(bag)
+    ckpt.write_bytes(pickle.dumps({"offset": 0}))
+    assert load_checkpoint(ckpt, fingerprint(bag), CONFIG) is None
+    ckpt.write_bytes(b"PK\x03\x04 truncated zip")
+    assert load_checkpoint(ckpt, fingerprint(bag), CONFIG) is None
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class _CountingParser(McapParser):
+    """Counts consumed records and optionally dies after *stop_after* of them."""
+
+    def __init__(self, *args, stop_after=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stop_after = stop_after
+        self.consumed = 0
+
+    def _consume_record(self, record, ds):
+        if self.consumed == self.stop_after:
+            raise _Interrupted
+        self.consumed += 1
+        super()._consume_record(record, ds)
+
+
+def _records_in_full_scan(bag):
+    parser = _CountingParser(bag)
+    parser.infer_tags()
+    return parser.consumed
+
+
+def _interrupt(bag, **kwargs):
+    with pytest.raises(_Interrupted):
+        _CountingParser(bag, checkpoint_interval=0, stop_after=120, **kwargs).infer_tags()
+    assert checkpoint_path(bag).exists()
+
+
+@pytest.mark.parametrize("read_ahead", [0, 2])
+def test_interrupted_scan_resumes_after_last_chunk(odometry_bag, read_ahead):
+    expected = McapParser(odometry_bag).infer_tags().to_json_str()
+    total = _records_in_full_scan(odometry_bag)
+    _interrupt(odometry_bag, read_ahead=read_ahead)
+
+    resumed = _CountingParser(odometry_bag, checkpoint_interval=0, read_ahead=read_ahead)
+    tags = resumed.infer_tags()
+
+    # Only the chunk cut short by the interruption is decoded again
+    assert total - 120 <= resumed.consumed < total - 100
+    assert tags.to_json_str() == expected
+    assert not checkpoint_path(odometry_bag).exists()
+
+
+def test_checkpoint_without_trajectory_is_not_resumed_with_geofences(odometry_bag, tmp_path):
+    area = [[0, -1], [50, -1], [50, 1], [0, 1], [0, -1]]
+    geojson = tmp_path / "areas.geojson"
+    geojson.write_text(
+        json.dumps(
+            {
+                "type": "Feature",
+                "properties": {"name": "start"},
+                "geometry": {"type": "Polygon", "coordinates": [area]},
+            }
+        )
+    )
+    geofences = GeofenceIndex.load(geojson, use_cache=False)
+    total = _records_in_full_scan(odometry_bag)
+    _interrupt(odometry_bag)
+
+    resumed = _CountingParser(odometry_bag, geofences=geofences, checkpoint_interval=0)
+    tags = resumed.infer_tags()
+
+    assert resumed.consumed == total  # scanned from the start
+    assert tags._tags["location"] == ["start"]
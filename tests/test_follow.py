@@ -0,0 +1,39 @@
+import json
+
+from ros2bag_tagger.mcap_parser import McapParser
+
+
+def _tags(ds):
+    tags = json.loads(ds.to_json_str())
+    del tags["time"]
+    return tags
+
+
+def test_poll_consumes_growing_file(odometry_bag, tmp_path):
+    data = odometry_bag.read_bytes()
+    live = tmp_path / "live.mcap"
+    live.write_bytes(data[:100])
+
+    parser = McapParser(live)
+    ds = parser._new_tags()
+    offsets = []
+    for cut in (100, len(data) // 3, 2 * len(data) // 3, len(data)):
+        live.write_bytes(data[:cut])
+        finished = parser.poll(ds)
+        assert parser._offset <= cut
+        offsets.append(parser._offset)
+        assert finished == (cut == len(data))
+
+    # Strictly forward while the data section grows; stops at DataEnd
+    assert offsets == sorted(set(offsets))
+    assert _tags(parser.snapshot(ds)) == _tags(McapParser(odometry_bag).infer_tags())
+
+
+def test_follow_writes_final_tags(odometry_bag, tmp_path):
+    out = tmp_path / "out.json"
+
+    tags = McapParser(odometry_bag).follow(out, poll_interval=0.0, idle_timeout=1.0)
+
+    written = json.loads(out.read_text())
+    assert written["velocity"] == [0.0, 29.0]
+    assert written == json.loads(tags.to_json_str())
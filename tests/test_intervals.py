@@ -0,0 +1,38 @@
+import numpy as np
+from ros2bag_tagger.intervals import IntervalSet
+
+
+def test_overlapping_ranges_counted_once():
+    s = IntervalSet.from_pairs([[5, 15], [0, 10], [20, 25], [25, 30], [40, 40]])
+
+    assert s.starts.tolist() == [0, 20]
+    assert s.ends.tolist() == [15, 30]
+    assert s.duration() == 25
+
+
+def test_union_and_intersection():
+    a = IntervalSet.from_pairs([[0, 10], [20, 30]])
+    b = IntervalSet.from_pairs([[5, 25], [28, 40]])
+
+    assert (a | b).duration() == 40
+    inter = a & b
+    assert list(zip(inter.starts.tolist(), inter.ends.tolist())) == [(5, 10), (20, 25), (28, 30)]
+    assert (a & IntervalSet.empty()).duration() == 0
+    assert a.coverage(0, 40) == 0.5
+
+
+def test_intersection_matches_sampling():
+    rng = np.random.default_rng(3)
+    starts = rng.uniform(0, 1000, 2000)
+    a = IntervalSet(starts, starts + rng.uniform(0, 5, 2000))
+    starts = rng.uniform(0, 1000, 2000)
+    b = IntervalSet(starts, starts + rng.uniform(0, 5, 2000))
+
+    grid = np.arange(0, 1005, 0.01)
+
+    def covered(s):
+        idx = np.searchsorted(s.starts, grid, side="right") - 1
+        return (idx >= 0) & (grid < s.ends[np.maximum(idx, 0)])
+
+    expected = (covered(a) & covered(b)).sum() * 0.01
+    assert abs((a & b).duration() - expected) < 1.0
@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pytest
+from ros2bag_tagger.location import GeofenceError, GeofenceIndex, _parse_geojson
+
+SQUARE = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+HOLE = [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]
+
+
+def _square(x0, y0, size=10):
+    return [[x0 + x * size / 10, y0 + y * size / 10] for x, y in SQUARE]
+
+
+@pytest.fixture
+def geojson(tmp_path):
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"name": "depot"},
+            "geometry": {"type": "Polygon", "coordinates": [SQUARE, HOLE]},
+        },
+        {
+            "type": "Feature",
+            "id": "campus",
+            "properties": {},
+            "geometry": {
+                "type": "MultiPolygon",
+                "coordinates": [[_square(100, 0)], [_square(200, 0)]],
+            },
+        },
+        {"type": "Feature", "properties": {"name": "pin"}, "geometry": {"type": "Point"}},
+    ]
+    path = tmp_path / "areas.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    return path
+
+
+def test_parse_geojson(geojson):
+    vertices, offsets, ring_part, part_area, names = _parse_geojson(geojson)
+
+    assert names.tolist() == ["depot", "campus"]  # feature id fallback, Point skipped
+    assert offsets.tolist() == [0, 4, 8, 12, 16]  # closing vertex dropped
+    assert ring_part.tolist() == [0, 0, 1, 2]  # outer ring and hole share part 0
+    assert part_area.tolist() == [0, 1, 1]
+    assert np.array_equal(vertices[4:8], np.array(HOLE[:-1], dtype=float))
+
+
+def test_areas_along_respects_holes(geojson):
+    index = GeofenceIndex.load(geojson, use_cache=False)
+
+    assert index.areas_along([[5.0, 5.0]]) == []  # inside the hole
+    assert index.areas_along([[2.0, 2.0]]) == ["depot"]
+    assert index.areas_along([[205.0, 5.0], [50.0, 50.0]]) == ["campus"]
+    assert index.areas_along([[2.0, 2.0], [105.0, 5.0]]) == ["campus", "depot"]
+
+
+def test_load_from_cache(geojson, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    built = GeofenceIndex.load(geojson)
+    cached = GeofenceIndex.load(geojson)
+
+    assert len(list((tmp_path / "cache" / "ros2bag_tagger").glob("areas-geofence-*.npz"))) == 1
+    assert cached.names.dtype.kind == "U"
+    points = [[2.0, 2.0], [5.0, 5.0], [105.0, 5.0]]
+    assert cached.areas_along(points) == built.areas_along(points) == ["campus", "depot"]
+    assert all(isinstance(name, str) for name in cached.areas_along(points))
+
+
+def test_unnamed_feature_is_rejected(tmp_path):
+    path = tmp_path / "bad.geojson"
+    path.write_text(
+        json.dumps({"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [SQUARE]}})
+    )
+    with pytest.raises(GeofenceError, match="without a name"):
+        GeofenceIndex.load(path, use_cache=False)
@@ -0,0 +1,54 @@
+import numpy as np
+from ros2bag_tagger.object_stats import FLUSH_FRAMES, LABELS, ObjectStats
+
+
+def test_object_stats_counts_frames_and_times():
+    stats = ObjectStats()
+    stats.update(np.array([1, 1, 7]), 1_000_000_000)
+    stats.update(np.array([], dtype=np.int64), 2_000_000_000)
+    stats.update(np.array([1, 99]), 3_000_000_000)  # 99 is not a known label
+
+    table = stats.to_dict()
+
+    assert stats.seen() == (("vehicle", "car"), ("pedestrian", "pedestrian"))
+    assert table["car"] == {
+        "group": "vehicle",
+        "count": 3,
+        "frames_present": 2,
+        "frames_fraction": 2 / 3,
+        "first_seen": 1.0,
+        "last_seen": 3.0,
+    }
+    assert table["pedestrian"]["count"] == 1
+    assert table["pedestrian"]["last_seen"] == 1.0
+
+
+def test_object_stats_buffered_frames_match_brute_force():
+    rng = np.random.default_rng(0)
+    frames = [
+        (rng.integers(0, len(LABELS) + 2, rng.integers(0, 6)).tolist(), int(t))
+        for t in rng.permutation(FLUSH_FRAMES + 500)
+    ]
+    stats = ObjectStats()
+    for labels, stamp in frames:
+        stats.update(labels, stamp)
+    stats.flush()
+
+    assert stats.n_frames == len(frames)
+    for label in range(len(LABELS)):
+        stamps = [stamp for labels, stamp in frames if label in labels]
+        assert stats.counts[label] == sum(labels.count(label) for labels, _ in frames)
+        assert stats.frames[label] == len(stamps)
+        assert stats.first_seen[label] == min(stamps)
+        assert stats.last_seen[label] == max(stamps)
+
+
+def test_object_stats_round_trip_through_arrays():
+    stats = ObjectStats()
+    stats.update([1, 7], 5)
+    stats.update([], 6)
+
+    restored = ObjectStats.from_arrays(stats.to_arrays())
+
+    assert restored.n_frames == 2
+    assert restored.to_dict() == stats.to_dict()
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from mcap.reader import make_reader
+from mcap.writer import CompressionType, Writer
+from ros2bag_tagger.mcap_parser import McapParser
+from ros2bag_tagger.quality import merge_quality, read_index_arrays, topic_quality
+
+
+def test_topic_quality_detects_drop_burst():
+    # 10 Hz with messages 20..24 missing (one burst of 5 dropped messages)
+    log_times = np.array([i * 100_000_000 for i in range(40) if not 20 <= i < 25], dtype=np.uint64)
+    publish_times = log_times - 1_000
+
+    stats = topic_quality(log_times, publish_times)
+
+    assert stats["message_count"] == 35
+    assert stats["max_gap"] == 0.6
+    assert stats["drop_bursts"] == 1
+    assert stats["dropped_messages"] == 5
+    assert np.isclose(stats["skew_mean"], 1e-6)
+
+
+def test_topic_quality_single_message_without_skew():
+    stats = topic_quality(np.array([5], dtype=np.uint64), np.zeros(0, dtype=np.uint64))
+    assert stats == {"message_count": 1}
+
+
+@pytest.mark.parametrize("compression", [CompressionType.NONE, CompressionType.ZSTD])
+def test_read_index_arrays_from_chunks(tmp_path, compression):
+    path = tmp_path / "raw.mcap"
+    with path.open("wb") as fh:
+        writer = Writer(fh, chunk_size=512, compression=compression)
+        writer.start()
+        front = writer.register_channel("/camera", "json", 0)
+        rear = writer.register_channel("/camera", "json", 0)
+        imu = writer.register_channel("/imu", "json", 0)
+        for i in range(50):
+            t = 1_000_000_000 + i * 100_000_000
+            writer.add_message(front, t, b"{}" * i, t - 2_000_000)
+            writer.add_message(rear, t + 50_000_000, b"{}", t + 50_000_000 - 4_000_000)
+            writer.add_message(imu, t, b"{}", t)
+        writer.finish()
+
+    with path.open("rb") as fh:
+        summary = make_reader(fh).get_summary()
+        assert len(summary.chunk_indexes) > 1
+        index_only = read_index_arrays(fh, summary)
+        with_skew = read_index_arrays(fh, summary, with_skew=True)
+
+    assert {k: len(v[0]) for k, v in index_only.items()} == {front: 50, rear: 50, imu: 50}
+    assert all(len(publish) == 0 for _, publish in index_only.values())
+    log_times, publish_times = with_skew[front]
+    assert np.array_equal(log_times - publish_times, np.full(50, 2_000_000, dtype=np.uint64))
+
+    parser = McapParser(path, quality=True, quality_skew=True)
+    parser.infer_tags()
+    camera = parser.quality_stats["/camera"]
+    assert camera["message_count"] == 100
+    assert camera["rate_hz"] == pytest.approx(20.0)  # both channels pooled, 50 ms apart
+    assert camera["skew_mean"] == pytest.approx(3e-3)
+    assert camera["skew_max"] == pytest.approx(4e-3)
+
+    index_parser = McapParser(path, quality=True)
+    index_parser.infer_tags()
+    assert index_parser.quality_stats["/imu"] == {
+        "message_count": 50,
+        "rate_hz": pytest.approx(10.0),
+        "max_gap": pytest.approx(0.1),
+        "drop_bursts": 0,
+        "dropped_messages": 0,
+    }
+
+
+def test_merge_quality_of_consecutive_splits():
+    log_times = np.arange(0, 6_000_000_000, 100_000_000, dtype=np.uint64)
+    log_times = np.delete(log_times, np.arange(40, 45))  # one burst in the second split
+    publish_times = log_times - 1_000
+    first, second = log_times < 3_000_000_000, log_times >= 3_000_000_000
+
+    merged = merge_quality(
+        topic_quality(log_times[first], publish_times[first]),
+        topic_quality(log_times[second], publish_times[second]),
+    )
+    whole = topic_quality(log_times, publish_times)
+
+    assert merge_quality(None, whole) == whole
+    assert merged["message_count"] == whole["message_count"] == 55
+    for key in ("max_gap", "drop_bursts", "dropped_messages", "skew_max"):
+        assert merged[key] == whole[key]
+    assert merged["rate_hz"] == pytest.approx(whole["rate_hz"], rel=0.01)  # boundary gap excluded
+    assert merged["skew_mean"] == pytest.approx(whole["skew_mean"])
@@ -0,0 +1,96 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import yaml
+from ros2bag_tagger.location import GeofenceIndex
+from ros2bag_tagger.mcap_parser import McapParser
+from ros2bag_tagger.recording import tag_recording
+
+SPLITS = ((0, 70), (70, 70), (140, 60))
+
+
+@pytest.fixture
+def recording(make_odometry_bag, tmp_path):
+    bag_dir = tmp_path / "rosbag2_run"
+    for i, (first, count) in enumerate(SPLITS):
+        make_odometry_bag(f"rosbag2_run/rosbag2_run_{i}.mcap", first=first, count=count)
+    metadata = {
+        "rosbag2_bagfile_information": {
+            "relative_file_paths": [f"rosbag2_run_{i}.mcap" for i in range(len(SPLITS))],
+            "starting_time": {"nanoseconds_since_epoch": 1_700_000_000 * 10**9},
+            "duration": {"nanoseconds": 19_900_000_000},
+        }
+    }
+    (bag_dir / "metadata.yaml").write_text(yaml.safe_dump(metadata))
+    return bag_dir
+
+
+@pytest.fixture
+def geofences(tmp_path):
+    area = [[100, -1], [200, -1], [200, 1], [100, 1], [100, -1]]
+    path = tmp_path / "areas.geojson"
+    path.write_text(
+        json.dumps(
+            {
+                "type": "Feature",
+                "properties": {"name": "middle"},
+                "geometry": {"type": "Polygon", "coordinates": [area]},
+            }
+        )
+    )
+    return GeofenceIndex.load(path, use_cache=False)
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_split_recording_matches_unsplit_bag(recording, odometry_bag, geofences, jobs):
+    merged = json.loads(tag_recording(recording, jobs=jobs, geofences=geofences).to_json_str())
+    single = json.loads(McapParser(odometry_bag, geofences=geofences).infer_tags().to_json_str())
+
+    # The sample-and-hold interval across each split boundary is not attributed
+    merged_stats = merged.pop("velocity_statistics")
+    single_stats = single.pop("velocity_statistics")
+    assert merged == single
+    assert merged["location"] == ["middle"]
+    for key in ("min", "max", "p5", "p50", "p95"):
+        assert merged_stats[key] == single_stats[key]
+    assert merged_stats["mean"] == pytest.approx(single_stats["mean"])
+    merged_seconds = sum(merged_stats["histogram"]["seconds"])
+    single_seconds = sum(single_stats["histogram"]["seconds"])
+    assert merged_seconds == pytest.approx(single_seconds - 0.1 * (len(SPLITS) - 1))
+
+
+def test_worker_kwargs_exclude_map_indexes(recording, geofences, monkeypatch):
+    import ros2bag_tagger.recording as recording_module
+
+    seen = []
+    scan_split = recording_module._scan_split
+
+    def spy(path, parser_kwargs):
+        seen.append(dict(parser_kwargs))
+        return scan_split(path, parser_kwargs)
+
+    monkeypatch.setattr(recording_module, "_scan_split", spy)
+    tags = tag_recording(recording, jobs=1, geofences=geofences)
+
+    assert len(seen) == len(SPLITS)
+    assert all("geofences" not in kwargs and kwargs["collect_trajectory"] for kwargs in seen)
+    assert tags._tags["location"] == ["middle"]
+
+
+def test_splits_are_scanned_in_parallel_by_default(recording, monkeypatch):
+    import ros2bag_tagger.recording as recording_module
+
+    pools = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers):
+            pools.append(max_workers)
+            super().__init__(max_workers)
+
+    monkeypatch.setattr(recording_module, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(recording_module.os, "cpu_count", lambda: 8)
+
+    tag_recording(recording)
+
+    assert pools == [len(SPLITS)]
@@ -0,0 +1,104 @@
+import math
+
+import numpy as np
+import pytest
+from ros2bag_tagger.road_shape import (
+    LaneletMapError,
+    RoadShapeMap,
+    _classify,
+    _heading_change,
+    _parse_osm,
+)
+
+
+def _write_osm(path, lanelets, local_xy=True):
+    """Write a Lanelet2 map; *lanelets* is a list of ``(left, right, extra_tags)``."""
+    lines = ['<?xml version="1.0"?>', '<osm version="0.6">']
+    ways, relations = [], []
+    node_id = way_id = 1
+    for rel_id, (left, right, extra) in enumerate(lanelets, start=1000):
+        bound_ids = []
+        for bound in (left, right):
+            refs = []
+            for x, y in bound:
+                tags = f'<tag k="local_x" v="{x}"/><tag k="local_y" v="{y}"/>' if local_xy else ""
+                lines.append(f'<node id="{node_id}" lat="0" lon="0">{tags}</node>')
+                refs.append(f'<nd ref="{node_id}"/>')
+                node_id += 1
+            ways.append(f'<way id="{way_id}">{"".join(refs)}</way>')
+            bound_ids.append(way_id)
+            way_id += 1
+        tags = {"type": "lanelet", "subtype": "road", **extra}
+        relations.append(
+            f'<relation id="{rel_id}">'
+            f'<member type="way" ref="{bound_ids[0]}" role="left"/>'
+            f'<member type="way" ref="{bound_ids[1]}" role="right"/>'
+            + "".join(f'<tag k="{k}" v="{v}"/>' for k, v in tags.items())
+            + "</relation>"
+        )
+    path.write_text("\n".join(lines + ways + relations + ["</osm>"]))
+    return path
+
+
+def _straight(y0):
+    return [(x, y0 + 3.0) for x in range(0, 31, 10)], [(x, y0) for x in range(0, 31, 10)]
+
+
+def _quarter_arc(cx, cy, radius, n=8):
+    angles = np.linspace(-math.pi / 2, 0, n)
+    return [(cx + radius * math.cos(a), cy + radius * math.sin(a)) for a in angles]
+
+
+@pytest.fixture
+def osm_map(tmp_path):
+    return _write_osm(
+        tmp_path / "map.osm",
+        [
+            (*_straight(0.0), {}),
+            (_quarter_arc(100.0, 20.0, 17.0), _quarter_arc(100.0, 20.0, 20.0), {}),
+            (*_straight(200.0), {"turn_direction": "straight"}),
+        ],
+    )
+
+
+def test_heading_change():
+    assert _heading_change(np.array([[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]])) == 0.0
+    assert _heading_change(np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]])) == pytest.approx(90.0)
+    # Repeated vertices do not create a heading change
+    assert _heading_change(np.array([[0.0, 0.0], [0.0, 0.0], [1.0, 0.0]])) == 0.0
+
+
+def test_classify():
+    left, right = (np.array(b, dtype=float) for b in _straight(0.0))
+    arc = np.array(_quarter_arc(0.0, 0.0, 10.0))
+    assert _classify(left, right, {}) == 2  # straight
+    assert _classify(arc, arc, {}) == 1  # curve
+    assert _classify(left, right, {"turn_direction": "left"}) == 0  # intersection
+
+
+def test_parse_osm(osm_map):
+    vertices, offsets, shape_ids = _parse_osm(osm_map)
+
+    assert shape_ids.tolist() == [2, 1, 0]
+    assert offsets.tolist() == [0, 8, 24, 32]
+    assert len(vertices) == offsets[-1]
+
+
+def test_shapes_along(osm_map, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    points = np.array([[15.0, 1.5], [118.0, 20.0 - 0.5], [15.0, 201.5], [500.0, 500.0]])
+
+    built = RoadShapeMap.load(osm_map)
+    cached = RoadShapeMap.load(osm_map)
+
+    assert built.shapes_along(points[:1]) == ["straight"]
+    assert built.shapes_along(points[3:]) == []
+    assert built.shapes_along(points) == ["curve", "intersection", "straight"]
+    assert cached.shapes_along(points) == built.shapes_along(points)
+    assert list((tmp_path / "cache" / "ros2bag_tagger").glob("*.npz"))
+
+
+def test_nodes_without_local_coordinates_are_rejected(tmp_path):
+    osm = _write_osm(tmp_path / "latlon.osm", [(*_straight(0.0), {})], local_xy=False)
+    with pytest.raises(LaneletMapError, match="local_x/local_y"):
+        RoadShapeMap.load(osm, use_cache=False)
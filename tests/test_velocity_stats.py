@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+from ros2bag_tagger.velocity_stats import BIN_WIDTH, VelocityStats
+
+
+def _feed(stats, values, start=0, period=100_000_000):
+    for i, v in enumerate(values):
+        stats.add(float(v), start + i * period)
+    return stats
+
+
+def test_percentiles_within_one_bin():
+    values = np.random.default_rng(1).uniform(0, 30, 5000)
+    stats = _feed(VelocityStats(), values)
+
+    for q in (5, 50, 95):
+        assert abs(stats.percentile(q) - np.percentile(values, q)) <= BIN_WIDTH
+    assert stats.min == values.min() and stats.max == values.max()
+
+
+def test_time_above_threshold_is_time_weighted():
+    # 10 s at 4 m/s followed by 5 s at 12 m/s, sampled at 10 Hz
+    stats = _feed(VelocityStats(), [4.0] * 100 + [12.0] * 51)
+
+    assert np.isclose(stats.time_above(10.0), 5.0)
+    assert np.isclose(stats.time_above(0.0), 15.0)
+
+
+def test_merge_matches_single_pass():
+    values = np.random.default_rng(2).normal(10, 3, 2000)
+    whole = _feed(VelocityStats(), values)
+    first = _feed(VelocityStats(), values[:1000])
+    second = _feed(VelocityStats(), values[1000:], start=1000 * 100_000_000)
+
+    merged = first.merge(second)
+
+    assert merged.n == whole.n
+    assert np.array_equal(merged.counts, whole.counts)
+    assert merged.percentile(50) == whole.percentile(50)
+    # Only the interval across the split boundary is not attributed
+    assert np.isclose(merged.durations.sum(), whole.durations.sum() - 0.1)
+
+
+def test_velocity_stats_round_trip_through_arrays():
+    assert VelocityStats.from_arrays(VelocityStats().to_arrays())._last_time is None
+
+    stats = VelocityStats()
+    for i, v in enumerate([3.0, 7.5, 12.0]):
+        stats.add(v, i * 100_000_000)
+    restored = VelocityStats.from_arrays(stats.to_arrays())
+    stats.add(9.0, 300_000_000)
+    restored.add(9.0, 300_000_000)
+
+    assert restored.to_dict() == stats.to_dict()
+
+
+def test_velocity_stats_ignores_non_finite_samples():
+    stats = VelocityStats()
+    for i, v in enumerate([5.0, float("nan"), float("inf"), float("-inf"), 7.0]):
+        stats.add(v, i * 100_000_000)
+
+    summary = stats.to_dict()
+
+    assert stats.n == 2
+    assert (summary["min"], summary["max"], summary["mean"]) == (5.0, 7.0, 6.0)
+    json.dumps(summary, allow_nan=False)
@@ -0,0 +1,59 @@
+import pytest
+import yaml
+from ros2bag_tagger.utils.bag_info import (
+    bag_files,
+    get_bag_times,
+    is_bag_directory,
+    is_mcap_bag_directory,
+)
+
+
+def test_bag_files_sorted_by_split_index(tmp_path):
+    for i in (10, 0, 2, 1):
+        (tmp_path / f"run_{i}.mcap").touch()
+
+    assert [f.name for f in bag_files(tmp_path)] == [
+        "run_0.mcap",
+        "run_1.mcap",
+        "run_2.mcap",
+        "run_10.mcap",
+    ]
+    assert bag_files(tmp_path / "run_0.mcap") == [tmp_path / "run_0.mcap"]
+
+
+def test_bag_files_and_times_from_metadata(tmp_path):
+    info = {
+        "relative_file_paths": ["run/run_1.mcap", "run/run_0.mcap"],
+        "starting_time": {"nanoseconds_since_epoch": 1_700_000_000_500_000_000},
+        "duration": {"nanoseconds": 2_000_000_000},
+    }
+    (tmp_path / "metadata.yaml").write_text(yaml.safe_dump({"rosbag2_bagfile_information": info}))
+
+    assert is_bag_directory(tmp_path)
+    assert [f.name for f in bag_files(tmp_path)] == ["run_1.mcap", "run_0.mcap"]
+    assert get_bag_times(tmp_path) == (1_700_000_000.5, 1_700_000_002.5)
+
+
+def test_bag_directory_times_fall_back_to_splits(make_odometry_bag, tmp_path):
+    make_odometry_bag("run/run_0.mcap", first=0, count=10)
+    make_odometry_bag("run/run_1.mcap", first=10, count=10)
+
+    start, end = get_bag_times(tmp_path / "run")
+
+    assert not is_bag_directory(tmp_path / "run")
+    assert (start, end) == pytest.approx((1_700_000_000.0, 1_700_000_001.9))
+
+
+@pytest.mark.parametrize(
+    "info, expected",
+    [
+        ({"storage_identifier": "mcap"}, True),
+        ({"storage_identifier": "sqlite3", "relative_file_paths": ["run_0.db3"]}, False),
+        ({"relative_file_paths": ["run_0.mcap", "run_1.mcap"]}, True),
+        ({"relative_file_paths": ["run_0.db3"]}, False),
+        ({}, False),  # and no .mcap file next to it
+    ],
+)
+def test_is_mcap_bag_directory(tmp_path, info, expected):
+    (tmp_path / "metadata.yaml").write_text(yaml.safe_dump({"rosbag2_bagfile_information": info}))
+    assert is_mcap_bag_directory(tmp_path) is expected
@@ -0,0 +1,31 @@
+from mcap.records import Footer, Message
+from mcap.stream_reader import MAGIC_SIZE
+from ros2bag_tagger.utils.mcap_stream import iter_complete_records
+
+
+def test_iter_complete_records_stops_at_partial_record(odometry_bag, tmp_path):
+    data = odometry_bag.read_bytes()
+    with odometry_bag.open("rb") as fh:
+        full = list(iter_complete_records(fh))
+    # Iteration ends at the footer, before the trailing magic
+    assert full[-1][0] == len(data) - MAGIC_SIZE and isinstance(full[-1][1], Footer)
+
+    partial = tmp_path / "partial.mcap"
+    cut = len(data) // 2
+    partial.write_bytes(data[:cut])
+    with partial.open("rb") as fh:
+        seen = list(iter_complete_records(fh))
+
+    ends = [end for end, _ in seen]
+    assert ends == [end for end, _ in full[: len(seen)]]
+    assert ends[-1] <= cut < full[len(seen)][0]
+
+
+def test_iter_complete_records_resumes_from_offset(odometry_bag):
+    with odometry_bag.open("rb") as fh:
+        full = list(iter_complete_records(fh))
+        middle = full[len(full) // 2][0]
+        rest = list(iter_complete_records(fh, middle))
+
+    assert [end for end, _ in rest] == [end for end, _ in full if end > middle]
+    assert not any(isinstance(rec, Message) for _, rec in full)  # messages live in chunks
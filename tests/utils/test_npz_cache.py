@@ -0,0 +1,33 @@
+import pickle
+
+import numpy as np
+from ros2bag_tagger.utils.npz_cache import cache_path_for, load_cached_arrays, save_cached_arrays
+
+
+def test_cached_arrays_round_trip(tmp_path):
+    path = tmp_path / "nested" / "index.npz"
+    save_cached_arrays(path, {"a": np.arange(3), "name": np.array(["x", "y"])})
+
+    arrays = load_cached_arrays(path)
+
+    assert np.array_equal(arrays["a"], np.arange(3))
+    assert arrays["name"].tolist() == ["x", "y"]
+    assert not list(path.parent.glob("*.tmp*"))
+
+
+def test_pickled_or_missing_cache_is_ignored(tmp_path):
+    path = tmp_path / "index.npz"
+    assert load_cached_arrays(path) is None
+    path.write_bytes(pickle.dumps(np.arange(3)))
+    assert load_cached_arrays(path) is None
+
+
+def test_cache_path_changes_with_source(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    source = tmp_path / "map.osm"
+    source.write_text("a")
+    before = cache_path_for(source, "road_shape-v1")
+    source.write_text("ab")
+
+    assert before.parent == tmp_path / "cache" / "ros2bag_tagger"
+    assert cache_path_for(source, "road_shape-v1") != before
@@ -0,0 +1,72 @@
+import random
+import threading
+
+import pytest
+from mcap.reader import make_reader
+from ros2bag_tagger.utils.prefetch import ChunkPrefetcher
+
+
+@pytest.fixture
+def chunk_indexes(odometry_bag):
+    with odometry_bag.open("rb") as fh:
+        indexes = make_reader(fh).get_summary().chunk_indexes
+    assert len(indexes) > 4
+    return indexes
+
+
+def _opener(path):
+    return lambda: path.open("rb")
+
+
+def _prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == "mcap-prefetch" and t.is_alive()]
+
+
+def test_chunks_come_in_file_order(odometry_bag, chunk_indexes):
+    shuffled = random.Random(0).sample(chunk_indexes, len(chunk_indexes))
+
+    pairs = list(ChunkPrefetcher(_opener(odometry_bag), shuffled, depth=2, read_size=1000))
+
+    offsets = [index.chunk_start_offset for index, _ in pairs]
+    assert offsets == sorted(c.chunk_start_offset for c in chunk_indexes)
+    for index, chunk in pairs:
+        assert chunk.message_start_time == index.message_start_time
+        assert chunk.uncompressed_size == index.uncompressed_size
+
+
+def test_reader_error_reaches_consumer(odometry_bag, chunk_indexes, tmp_path):
+    truncated = tmp_path / "truncated.mcap"
+    truncated.write_bytes(odometry_bag.read_bytes()[: chunk_indexes[2].chunk_start_offset + 50])
+
+    received = []
+    with pytest.raises(EOFError, match="Truncated chunk"):
+        for index, _ in ChunkPrefetcher(_opener(truncated), chunk_indexes, depth=4):
+            received.append(index.chunk_start_offset)
+
+    assert received == [c.chunk_start_offset for c in chunk_indexes[:2]]
+    assert not _prefetch_threads()
+
+
+def test_consumer_break_stops_reader(odometry_bag, chunk_indexes):
+    chunks = iter(ChunkPrefetcher(_opener(odometry_bag), chunk_indexes, depth=1))
+    next(chunks)
+    assert _prefetch_threads()  # blocked on the full queue
+
+    closer = threading.Thread(target=chunks.close)
+    closer.start()
+    closer.join(timeout=5)
+
+    assert not closer.is_alive()
+    assert not _prefetch_threads()
+
+
+def test_depth_zero_reads_inline(odometry_bag, chunk_indexes, monkeypatch):
+    started = []
+    monkeypatch.setattr(threading.Thread, "start", lambda self: started.append(self))
+
+    inline = list(ChunkPrefetcher(_opener(odometry_bag), chunk_indexes, depth=0))
+
+    assert not started
+    assert [index.chunk_start_offset for index, _ in inline] == sorted(
+        c.chunk_start_offset for c in chunk_indexes
+    )
@@ -0,0 +1,59 @@
+import numpy as np
+from ros2bag_tagger.utils.spatial_index import (
+    STRTree,
+    points_in_polygons,
+    polygon_bounds,
+)
+
+
+def _brute_force_pairs(bounds, points):
+    hit = (
+        (bounds[None, :, 0] <= points[:, None, 0])
+        & (points[:, None, 0] <= bounds[None, :, 2])
+        & (bounds[None, :, 1] <= points[:, None, 1])
+        & (points[:, None, 1] <= bounds[None, :, 3])
+    )
+    return set(zip(*(idx.tolist() for idx in np.nonzero(hit))))
+
+
+def test_str_tree_matches_brute_force():
+    rng = np.random.default_rng(0)
+    lower = rng.uniform(0, 100, (500, 2))
+    bounds = np.hstack([lower, lower + rng.uniform(0.5, 5, (500, 2))])
+    points = rng.uniform(0, 100, (300, 2))
+
+    point_idx, item_idx = STRTree(bounds, capacity=8).query_points(points)
+
+    assert set(zip(point_idx.tolist(), item_idx.tolist())) == _brute_force_pairs(bounds, points)
+
+
+def test_str_tree_round_trip_through_arrays():
+    bounds = np.array([[0, 0, 1, 1], [2, 2, 3, 3], [0, 0, 3, 3]], dtype=float)
+    tree = STRTree.from_arrays(STRTree(bounds, capacity=2).to_arrays())
+
+    point_idx, item_idx = tree.query_points([[0.5, 0.5], [10, 10]])
+
+    assert point_idx.tolist() == [0, 0]
+    assert sorted(item_idx.tolist()) == [0, 2]
+
+
+def test_str_tree_empty():
+    point_idx, item_idx = STRTree(np.zeros((0, 4))).query_points([[0, 0]])
+    assert len(point_idx) == len(item_idx) == 0
+
+
+def test_points_in_polygons_concave():
+    # "L" shaped polygon followed by a unit square
+    vertices = np.array(
+        [[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2], [5, 5], [6, 5], [6, 6], [5, 6]],
+        dtype=float,
+    )
+    offsets = np.array([0, 6, 10])
+    points = np.array([[0.5, 1.5], [1.5, 1.5], [5.5, 5.5]])
+
+    inside = points_in_polygons(
+        points, np.array([0, 1, 2, 2]), np.array([0, 0, 1, 0]), vertices, offsets
+    )
+
+    assert inside.tolist() == [True, False, True, False]
+    assert polygon_bounds(vertices, offsets).tolist() == [[0, 0, 2, 2], [5, 5, 6, 6]]